@@ -1,16 +1,22 @@
 """Streamlit web interface for Company Research Agent V2.8."""
 
 import streamlit as st
+import asyncio
+import atexit
 import json
 import time
 import sys
 import io
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from contextlib import redirect_stdout, redirect_stderr
-from urllib.parse import urlparse
+from urllib.parse import urlsplit
+from streamlit.runtime.scriptrunner import add_script_run_ctx
 
 from company_research.schema import ResearchBrief, ResearchState
-from company_research.agents.graph import build_graph
+from company_research.agents.graph import build_graph, run_graph
 from company_research.storage import save_state
 from company_research import logger
 from company_research.logger import format_size
@@ -28,36 +34,99 @@ st.set_page_config(
 if 'research_complete' not in st.session_state:
     st.session_state.research_complete = False
     st.session_state.report_md = None
+    st.session_state.report_md_len = 0
     st.session_state.report_json = None
+    st.session_state.report_json_str = None  # Serialized once for downloads
     st.session_state.company_name = None
     st.session_state.elapsed_time = None
     st.session_state.final_state = None
 
 
 class StreamlitLogger:
-    """Capture print output and stream to Streamlit container."""
+    """Capture print output and stream to Streamlit container.
 
-    def __init__(self, container):
+    Writes only enqueue text; a background thread coalesces queued lines and
+    renders them, so printing from the research workers never blocks on the UI.
+    Use as a context manager to guarantee a final flush.
+
+    Rendering is incremental: each flush appends only the newly drained lines
+    to the rendered text, which is capped at ``max_chars``, so the cost of a
+    flush is proportional to the new output rather than the whole log.
+    """
+
+    def __init__(self, container, max_chars=20000):
         self.container = container
-        self.log_buffer = []
+        self.max_chars = max_chars
+        self._new_lines = []  # Drained but not yet rendered
+        self._rendered = ''  # Tail of the log as last shown
+        self.pending = queue.SimpleQueue()
+        self.pending_chars = 0
         self.last_update = time.time()
-        self.update_interval = 0.1  # Update every 100ms
+        self.update_interval = 0.2  # Render at most every 200ms
+        self.min_batch_chars = 2048  # ...and only once this much text is pending
+        self.max_wait = 1.0  # ...or this many seconds have passed
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+        add_script_run_ctx(self._flusher)  # Allow rendering from the thread
+        self._flusher.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
 
     def write(self, text):
         if text.strip():
-            self.log_buffer.append(text.rstrip())
+            self.pending.put(text.rstrip())
 
-            # Throttle updates to avoid overwhelming Streamlit
-            now = time.time()
-            if now - self.last_update > self.update_interval:
-                self.flush()
-                self.last_update = now
+    def _drain(self):
+        """Move queued lines into the unrendered batch."""
+        while True:
+            try:
+                line = self.pending.get_nowait()
+            except queue.Empty:
+                return
+            self._new_lines.append(line)
+            self.pending_chars += len(line)
+
+    def _flush_loop(self):
+        while not self._stop.wait(self.update_interval):
+            with self._lock:
+                self._drain()
+                elapsed = time.time() - self.last_update
+                # Throttle updates to avoid overwhelming Streamlit
+                if self.pending_chars and (
+                    self.pending_chars >= self.min_batch_chars or elapsed > self.max_wait
+                ):
+                    self._render()
+
+    def _render(self):
+        if self._new_lines:
+            # Append only the new lines to the retained tail and display
+            new_text = '\n'.join(self._new_lines)
+            self._new_lines.clear()
+            if self._rendered:
+                self._rendered = self._rendered[-self.max_chars:] + '\n' + new_text
+            else:
+                self._rendered = new_text
+            self.container.code(self._rendered, language='')
+        self.pending_chars = 0
+        self.last_update = time.time()
 
     def flush(self):
-        if self.log_buffer:
-            # Join all logs and display
-            full_log = '\n'.join(self.log_buffer)
-            self.container.code(full_log, language='')
+        with self._lock:
+            self._drain()
+            self._render()
+
+    def close(self):
+        """Stop the background flusher and render everything still queued."""
+        self._stop.set()
+        if self._flusher.is_alive():
+            self._flusher.join()
+        self.flush()
 
 
 def validate_urls(urls_text):
@@ -65,24 +134,47 @@ def validate_urls(urls_text):
     if not urls_text.strip():
         return None, "Please provide at least one seed URL"
 
-    urls = [url.strip() for url in urls_text.strip().split('\n') if url.strip()]
+    urls = [url for url in map(str.strip, urls_text.splitlines()) if url]
 
     if not urls:
         return None, "Please provide at least one valid URL"
 
     # Basic URL validation
     for url in urls:
-        if not url.startswith('http://') and not url.startswith('https://'):
+        if not url.startswith(('http://', 'https://')):
             return None, f"Invalid URL (must start with http:// or https://): {url}"
 
     return urls, None
 
 
+@st.cache_data(show_spinner=False)
+def _parse_config(raw: bytes):
+    """Parse an uploaded config file, memoized on its bytes across reruns."""
+    return json.loads(raw)
+
+
+@st.cache_resource(show_spinner=False)
+def _get_app():
+    """Build the LangGraph workflow once and reuse it across runs."""
+    return build_graph()
+
+
+@st.cache_resource(show_spinner=False)
+def _get_save_pool():
+    """Single background writer for state snapshots, shared across reruns."""
+    pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="save-state")
+    atexit.register(pool.shutdown)
+    return pool
+
+
 def run_research(company_name, research_question, seed_urls, verbose=True):
     """Execute the research workflow."""
 
+    # Drop duplicate seed URLs (order preserved) so nothing is fetched twice
+    seed_urls = list(dict.fromkeys(seed_urls))
+
     # Extract allowed domains
-    allowed_domains = sorted(set(urlparse(u).netloc for u in seed_urls))
+    allowed_domains = sorted({urlsplit(u).netloc for u in seed_urls})
 
     # Create research brief
     brief = ResearchBrief(
@@ -102,20 +194,60 @@ def run_research(company_name, research_question, seed_urls, verbose=True):
 
     # Create state and graph
     state = ResearchState(brief=brief)
-    app = build_graph()
+    app = _get_app()
 
     # Execute workflow
     start_time = time.time()
-    final_state = app.invoke({"state": state})
+    research_state = asyncio.run(run_graph(app, state))
     elapsed = time.time() - start_time
-
-    # Extract results
-    research_state = final_state["state"]
-    save_state(research_state)
+    # Persist off the request path - the UI does not wait on disk I/O
+    _get_save_pool().submit(save_state, research_state)
 
     return research_state, elapsed
 
 
+@st.fragment
+def render_downloads():
+    """Render download buttons and JSON data in their own fragment.
+
+    Interacting with these widgets reruns only this fragment, so the full
+    markdown report above is not re-sent to the browser.
+    """
+    st.subheader("⬇ Download Reports")
+    col1, col2 = st.columns(2)
+
+    safe_company_name = st.session_state.company_name.lower().replace(' ', '_')
+
+    with col1:
+        if st.session_state.report_md:
+            st.download_button(
+                label="📥 Download Markdown Report",
+                data=st.session_state.report_md,
+                file_name=f"{safe_company_name}_private_investing_report.md",
+                mime="text/markdown",
+                use_container_width=True
+            )
+        else:
+            st.button("📥 Download Markdown Report", disabled=True, use_container_width=True)
+
+    with col2:
+        if st.session_state.report_json:
+            st.download_button(
+                label="📥 Download JSON Report",
+                data=st.session_state.report_json_str,
+                file_name=f"{safe_company_name}_private_investing_report.json",
+                mime="application/json",
+                use_container_width=True
+            )
+        else:
+            st.button("📥 Download JSON Report", disabled=True, use_container_width=True)
+
+    # JSON Data Expander
+    if st.session_state.report_json:
+        with st.expander("🔍 View Structured JSON Data"):
+            st.json(st.session_state.report_json)
+
+
 # ============================================================================
 # MAIN APP
 # ============================================================================
@@ -143,7 +275,7 @@ if st.session_state.research_complete:
         st.metric("Sub-Agents", len(st.session_state.final_state.sub_agent_results))
     with col4:
         if st.session_state.report_md:
-            st.metric("Report Size", format_size(len(st.session_state.report_md)))
+            st.metric("Report Size", format_size(st.session_state.report_md_len))
         else:
             st.metric("Report Size", "N/A")
 
@@ -158,40 +290,7 @@ if st.session_state.research_complete:
 
     st.markdown("---")
 
-    # Download buttons
-    st.subheader("⬇ Download Reports")
-    col1, col2 = st.columns(2)
-
-    safe_company_name = st.session_state.company_name.lower().replace(' ', '_')
-
-    with col1:
-        if st.session_state.report_md:
-            st.download_button(
-                label="📥 Download Markdown Report",
-                data=st.session_state.report_md,
-                file_name=f"{safe_company_name}_private_investing_report.md",
-                mime="text/markdown",
-                use_container_width=True
-            )
-        else:
-            st.button("📥 Download Markdown Report", disabled=True, use_container_width=True)
-
-    with col2:
-        if st.session_state.report_json:
-            st.download_button(
-                label="📥 Download JSON Report",
-                data=json.dumps(st.session_state.report_json, indent=2),
-                file_name=f"{safe_company_name}_private_investing_report.json",
-                mime="application/json",
-                use_container_width=True
-            )
-        else:
-            st.button("📥 Download JSON Report", disabled=True, use_container_width=True)
-
-    # JSON Data Expander
-    if st.session_state.report_json:
-        with st.expander("🔍 View Structured JSON Data"):
-            st.json(st.session_state.report_json)
+    render_downloads()
 
     st.markdown("---")
 
@@ -269,10 +368,9 @@ https://www.wellington.com/en/capabilities/private-investing/value-creation""",
                         log_container = st.empty()
 
                         try:
-                            # Capture stdout
-                            log_writer = StreamlitLogger(log_container)
-
-                            with redirect_stdout(log_writer), redirect_stderr(log_writer):
+                            # Capture stdout; the logger flushes on exit
+                            with StreamlitLogger(log_container) as log_writer, \
+                                    redirect_stdout(log_writer), redirect_stderr(log_writer):
                                 research_state, elapsed = run_research(
                                     company_name=company_name,
                                     research_question=research_question,
@@ -280,13 +378,15 @@ https://www.wellington.com/en/capabilities/private-investing/value-creation""",
                                     verbose=verbose
                                 )
 
-                            # Flush final logs
-                            log_writer.flush()
-
                             # Store results
                             st.session_state.research_complete = True
                             st.session_state.report_md = research_state.report_markdown
+                            st.session_state.report_md_len = len(research_state.report_markdown or "")
                             st.session_state.report_json = research_state.report_json
+                            st.session_state.report_json_str = (
+                                json.dumps(research_state.report_json, indent=2)
+                                if research_state.report_json else None
+                            )
                             st.session_state.company_name = company_name
                             st.session_state.elapsed_time = elapsed
                             st.session_state.final_state = research_state
@@ -310,7 +410,7 @@ https://www.wellington.com/en/capabilities/private-investing/value-creation""",
 
         if uploaded_file:
             try:
-                config = json.load(uploaded_file)
+                config = _parse_config(uploaded_file.getvalue())
 
                 # Preview
                 st.success("✅ Config file loaded successfully")
@@ -339,7 +439,7 @@ https://www.wellington.com/en/capabilities/private-investing/value-creation""",
                     else:
                         company_name = config['company_name']
                         research_question = config.get('request', "Analyze private markets and investing activities")
-                        seed_urls = config['seed_urls']
+                        seed_urls = [u.strip() for u in config['seed_urls']]
 
                         # Run research
                         st.info(f"🚀 Starting research for {company_name}...")
@@ -349,10 +449,9 @@ https://www.wellington.com/en/capabilities/private-investing/value-creation""",
                         log_container = st.empty()
 
                         try:
-                            # Capture stdout
-                            log_writer = StreamlitLogger(log_container)
-
-                            with redirect_stdout(log_writer), redirect_stderr(log_writer):
+                            # Capture stdout; the logger flushes on exit
+                            with StreamlitLogger(log_container) as log_writer, \
+                                    redirect_stdout(log_writer), redirect_stderr(log_writer):
                                 research_state, elapsed = run_research(
                                     company_name=company_name,
                                     research_question=research_question,
@@ -360,13 +459,15 @@ https://www.wellington.com/en/capabilities/private-investing/value-creation""",
                                     verbose=verbose_upload
                                 )
 
-                            # Flush final logs
-                            log_writer.flush()
-
                             # Store results
                             st.session_state.research_complete = True
                             st.session_state.report_md = research_state.report_markdown
+                            st.session_state.report_md_len = len(research_state.report_markdown or "")
                             st.session_state.report_json = research_state.report_json
+                            st.session_state.report_json_str = (
+                                json.dumps(research_state.report_json, indent=2)
+                                if research_state.report_json else None
+                            )
                             st.session_state.company_name = company_name
                             st.session_state.elapsed_time = elapsed
                             st.session_state.final_state = research_state
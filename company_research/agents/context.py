@@ -0,0 +1,422 @@
+"""Context building from scraped pages for research prompts."""
+
+import re
+import threading
+from collections import OrderedDict
+from typing import List, Collection, Set
+from urllib.parse import urlsplit
+from ..config import SMART_EXTRACT, SMART_EXTRACT_MAX_CHARS, SMART_EXTRACT_WINDOW
+from ..schema import PageContent
+from ..storage import cache_key, load_cached, save_cached
+from ..logger import log_verbose
+
+
+# (question pattern, ranking keywords); every rule whose pattern occurs in the
+# question contributes its keywords, in this order
+_KEYWORD_RULES = [
+    (re.compile(r"news|announcement", re.IGNORECASE),
+     ["news", "announcement", "press release", "announced", "partnership", "acquisition", "fund closure", "appointment", "award"]),
+    (re.compile(r"decision maker|leadership|team", re.IGNORECASE),
+     ["team", "leadership", "partner", "director", "executive", "ceo", "cfo", "cto", "management", "our team"]),
+    (re.compile(r"portfolio|companies|invest", re.IGNORECASE),
+     ["portfolio", "investment", "company", "companies", "case study", "exits", "acquisition"]),
+    (re.compile(r"aum|assets", re.IGNORECASE),
+     ["aum", "assets under management", "billion", "million", "capital", "fund size"]),
+    (re.compile(r"strategy|fund", re.IGNORECASE),
+     ["strategy", "fund", "approach", "focus", "program", "venture", "growth", "stage"]),
+    (re.compile(r"region|sector", re.IGNORECASE),
+     ["region", "sector", "industry", "geography", "market", "focus area"]),
+]
+
+
+def extract_keywords(question: str) -> List[str]:
+    """Extract key terms from question for relevance ranking.
+
+    V2.9: Helper for smart context building
+
+    Args:
+        question: Research question
+
+    Returns:
+        List of keywords to look for
+    """
+    keywords = []
+    for pattern, rule_keywords in _KEYWORD_RULES:
+        if pattern.search(question):
+            keywords.extend(rule_keywords)
+    return keywords
+
+
+def calculate_page_relevance(page: PageContent, keywords: List[str]) -> float:
+    """Calculate relevance score for a page based on keywords.
+
+    V2.9: Used for smart context ranking
+
+    Args:
+        page: Page content
+        keywords: List of keywords to search for
+
+    Returns:
+        Relevance score (higher is more relevant)
+    """
+    if not keywords:
+        return 1.0  # No keywords = equal relevance
+
+    # Counts are memoized on the page: the scan only runs for keywords no
+    # earlier question has scored this page on
+    counts = page.keyword_counts
+    missing = [keyword for keyword in keywords if keyword not in counts]
+    if missing:
+        # Title and text are lowercased once per page and counted separately
+        # (no concatenated copy of the text)
+        for keyword in missing:
+            keyword_lower = keyword.lower()
+            counts[keyword] = page.title_lower.count(keyword_lower) + page.text_lower.count(keyword_lower)
+
+    text_len = len(page.title) + 1 + len(page.text)
+    score = 0.0
+
+    for keyword in keywords:
+        # Count occurrences (normalized by text length to favor density over volume)
+        count = counts[keyword]
+        if count > 0:
+            # Title matches worth more
+            if keyword.lower() in page.title_lower:
+                score += 5.0
+            # Content matches
+            score += count * (1000.0 / max(text_len, 1000))  # Normalize by text length
+
+    return score
+
+
+# Per-question page selection: keep this many top-scoring pages, unless
+# together they hold less text than the floor (then the full corpus is used)
+RELEVANT_TOP_K = 8
+MIN_SELECTED_CHARS = 20_000
+
+
+def select_relevant_pages(
+    pages: Collection[PageContent],
+    question: str,
+    top_k: int = RELEVANT_TOP_K,
+    min_chars: int = MIN_SELECTED_CHARS
+) -> List[PageContent]:
+    """Pick the pages most relevant to a question.
+
+    Pages are scored with ``calculate_page_relevance`` and the top ``top_k``
+    with a non-zero score are kept. The full corpus is returned when the
+    question yields no keywords, when there are at most ``top_k`` pages, or
+    when the selected pages hold fewer than ``min_chars`` characters.
+
+    Args:
+        pages: All available page content
+        question: Research question
+        top_k: Maximum pages to keep
+        min_chars: Minimum text the selection must hold
+
+    Returns:
+        Selected pages, most relevant first (or all pages, in order)
+    """
+    pages = list(pages)
+    keywords = extract_keywords(question)
+    if not keywords or len(pages) <= top_k:
+        return pages
+
+    scored = sorted(
+        ((calculate_page_relevance(p, keywords), p) for p in pages),
+        key=lambda item: item[0],
+        reverse=True,
+    )
+    selected = [p for score, p in scored[:top_k] if score > 0]
+    if sum(len(p.text) for p in selected) < min_chars:
+        return pages
+
+    log_verbose(f"      Page selection: {len(selected)} of {len(pages)} pages for question")
+    return selected
+
+
+# Pages whose word-shingle sets overlap more than this are near-duplicates
+NEAR_DUPLICATE_JACCARD = 0.9
+_SHINGLE_SIZE = 5
+
+
+def canonical_url(url: str) -> str:
+    """Reduce a URL to lowercased host + path for duplicate detection.
+
+    Scheme, query string (tracking params), fragment and trailing slash
+    are ignored.
+
+    Args:
+        url: Page URL
+
+    Returns:
+        Canonical form of the URL
+    """
+    parts = urlsplit(url)
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    return host + (parts.path.rstrip("/") or "/")
+
+
+def _shingles(text_lower: str) -> Set[int]:
+    """Hash the overlapping word 5-grams of a text.
+
+    Args:
+        text_lower: Lowercased page text (``PageContent.text_lower``)
+
+    Returns:
+        Set of shingle hashes
+    """
+    words = text_lower.split()
+    if len(words) < _SHINGLE_SIZE:
+        return {hash(" ".join(words))}
+    return {
+        hash(" ".join(words[i:i + _SHINGLE_SIZE]))
+        for i in range(len(words) - _SHINGLE_SIZE + 1)
+    }
+
+
+def dedupe_pages(pages: Collection[PageContent]) -> List[PageContent]:
+    """Drop duplicate and near-duplicate pages, keeping the first seen.
+
+    A page is dropped when its canonical URL was already seen, or when its
+    text shares more than ``NEAR_DUPLICATE_JACCARD`` of its word shingles
+    with an earlier page (e.g. the same page behind two URLs).
+
+    Args:
+        pages: Pages in their original order
+
+    Returns:
+        Pages with duplicates removed, order preserved
+    """
+    kept: List[PageContent] = []
+    kept_shingles: List[Set[int]] = []
+    seen_urls: Set[str] = set()
+
+    for page in pages:
+        url = canonical_url(str(page.url))
+        if url in seen_urls:
+            continue
+        shingles = _shingles(page.text_lower)
+        if any(
+            len(shingles & other) / len(shingles | other) > NEAR_DUPLICATE_JACCARD
+            for other in kept_shingles
+        ):
+            continue
+        seen_urls.add(url)
+        kept.append(page)
+        kept_shingles.append(shingles)
+
+    if len(kept) < len(pages):
+        log_verbose(f"      Context dedupe: dropped {len(pages) - len(kept)} duplicate pages")
+    return kept
+
+
+# Paragraphs at least this long are dropped when an earlier page already
+# contained them (shorter ones, e.g. headings, may legitimately repeat)
+MIN_DEDUPE_PARAGRAPH_CHARS = 80
+
+
+def dedupe_paragraphs(pages: Collection[PageContent]) -> List[PageContent]:
+    """Drop paragraphs already seen on an earlier page.
+
+    Site-wide boilerplate (navigation, footers, cookie banners) repeats on
+    every page; only its first occurrence is kept. Paragraphs are compared
+    after lowercasing and collapsing whitespace.
+
+    Args:
+        pages: Pages in their original order
+
+    Returns:
+        Pages with repeated paragraphs removed (unchanged pages are the
+        same objects)
+    """
+    seen: Set[int] = set()
+    deduped: List[PageContent] = []
+    dropped_chars = 0
+
+    for page in pages:
+        kept = []
+        for paragraph in page.text.split("\n\n"):
+            if len(paragraph) >= MIN_DEDUPE_PARAGRAPH_CHARS:
+                fingerprint = hash(" ".join(paragraph.lower().split()))
+                if fingerprint in seen:
+                    dropped_chars += len(paragraph) + 2
+                    continue
+                seen.add(fingerprint)
+            kept.append(paragraph)
+
+        if len(kept) == page.text.count("\n\n") + 1:
+            deduped.append(page)
+        else:
+            deduped.append(PageContent(
+                url=page.url, title=page.title, text="\n\n".join(kept), raw_html=page.raw_html
+            ))
+
+    if dropped_chars:
+        log_verbose(f"      Context dedupe: dropped {dropped_chars} chars of repeated paragraphs")
+    return deduped
+
+
+CONTEXT_RULE = "=" * 80
+
+
+def render_sources(pages: Collection[PageContent]) -> str:
+    """Render pages as numbered source blocks, each preceded by a rule.
+
+    Fragments are collected in a list and joined once.
+
+    Args:
+        pages: Pages in the order they should be numbered
+
+    Returns:
+        Context string
+    """
+    separator = f"\n\n{CONTEXT_RULE}\n\n"
+    parts: List[str] = []
+    for i, p in enumerate(pages, start=1):
+        parts.append(separator)
+        parts.append(f"=== SOURCE [{i}] ===")
+        parts.append(p.source_block)
+    return "".join(parts)
+
+
+# Recently built contexts, keyed like the "contexts" disk cache (page content
+# digests and ranking keywords). Sub-agents with the same question type share
+# one ranking, and a shared (unranked) corpus context is built once per
+# page set.
+_CONTEXT_CACHE: "OrderedDict[str, str]" = OrderedDict()
+_CONTEXT_CACHE_SIZE = 16
+_context_cache_lock = threading.Lock()
+
+
+def build_context(pages: Collection[PageContent], question: str = None) -> str:
+    """Build context string from pages with smart relevance ranking.
+
+    V2.9: Pages are ranked by keyword relevance to question,
+    with most relevant pages placed first for better LLM attention.
+
+    Duplicate and near-duplicate pages are dropped first, then paragraphs
+    repeated across pages (see ``dedupe_pages``, ``dedupe_paragraphs``).
+    Results are memoized in memory and on disk under one key: a hash of each
+    page's source block (URL, title and text), the ranking keywords and the
+    SMART_EXTRACT settings, so warm runs over the same pages skip assembly
+    entirely and any change to a page's content misses.
+
+    Args:
+        pages: PageContent objects (list or other re-iterable collection)
+        question: Research question (optional, for smart ranking)
+
+    Returns:
+        Formatted context string with content ranked by relevance
+    """
+    keywords = extract_keywords(question) if question else []
+    key = cache_key(
+        *(p.source_digest for p in pages),
+        "\x1e".join(keywords),
+        f"smart_extract={SMART_EXTRACT and (SMART_EXTRACT_MAX_CHARS, SMART_EXTRACT_WINDOW)}"
+    )
+    with _context_cache_lock:
+        context = _CONTEXT_CACHE.get(key)
+        if context is not None:
+            _CONTEXT_CACHE.move_to_end(key)
+    if context is not None:
+        log_verbose(f"      Context reused from cache ({len(pages)} pages)")
+        return context
+
+    context = load_cached("contexts", key)
+    if context is None:
+        context = _assemble_context(pages, keywords)
+        save_cached("contexts", key, context)
+    else:
+        log_verbose(f"      Context loaded from disk cache ({len(pages)} pages)")
+
+    with _context_cache_lock:
+        _CONTEXT_CACHE[key] = context
+        while len(_CONTEXT_CACHE) > _CONTEXT_CACHE_SIZE:
+            _CONTEXT_CACHE.popitem(last=False)
+    return context
+
+
+def _assemble_context(pages: Collection[PageContent], keywords: List[str]) -> str:
+    """Dedupe, rank and render pages into a context string (uncached).
+
+    Args:
+        pages: PageContent objects
+        keywords: Ranking keywords (empty to keep the pages' order)
+
+    Returns:
+        Formatted context string
+    """
+    pages = dedupe_paragraphs(dedupe_pages(pages))
+
+    # Smart ranking if question provided
+    if keywords:
+        # Calculate relevance and sort
+        pages_with_scores = [(p, calculate_page_relevance(p, keywords)) for p in pages]
+        pages_with_scores.sort(key=lambda x: x[1], reverse=True)
+        sorted_pages = [p for p, score in pages_with_scores]
+
+        log_verbose(f"      Context ranking: Using {len(keywords)} keywords to rank {len(pages)} pages")
+        if SMART_EXTRACT:
+            sorted_pages = [_windowed_page(p, keywords) for p in sorted_pages]
+    else:
+        sorted_pages = pages
+
+    # Build context with ranked pages
+    return render_sources(sorted_pages)
+
+
+# Marks text dropped between relevant windows
+WINDOW_GAP = "\n[...]\n"
+
+
+def extract_relevant_windows(text: str, keywords: List[str], window: int = SMART_EXTRACT_WINDOW) -> str:
+    """Keep only the text around keyword hits.
+
+    Every hit is widened by ``window`` chars on each side, overlapping ranges
+    are merged, and the ranges are joined with ``WINDOW_GAP`` markers.
+
+    Args:
+        text: Page text
+        keywords: Keywords to locate (matched case-insensitively)
+        window: Chars kept either side of a hit
+
+    Returns:
+        The relevant windows, or an empty string if no keyword occurs
+    """
+    pattern = re.compile("|".join(re.escape(k) for k in keywords), re.IGNORECASE)
+    ranges: List[List[int]] = []
+    for match in pattern.finditer(text):
+        start, end = max(0, match.start() - window), match.end() + window
+        if ranges and start <= ranges[-1][1]:
+            ranges[-1][1] = max(ranges[-1][1], end)
+        else:
+            ranges.append([start, end])
+    return WINDOW_GAP.join(text[start:end] for start, end in ranges)
+
+
+def _windowed_page(page: PageContent, keywords: List[str]) -> PageContent:
+    """Cut an over-budget page down to its keyword windows (SMART_EXTRACT).
+
+    Pages within SMART_EXTRACT_MAX_CHARS are kept whole, as are pages whose
+    title matches a keyword in news questions (to preserve news listings)
+    and pages with no keyword hits.
+
+    Args:
+        page: Page to cut
+        keywords: Ranking keywords
+
+    Returns:
+        The page itself, or a new PageContent holding only the windows
+    """
+    if len(page.text) <= SMART_EXTRACT_MAX_CHARS:
+        return page
+    if "news" in keywords and any(k in page.title_lower for k in keywords):
+        return page
+    text = extract_relevant_windows(page.text, keywords)
+    if not text or len(text) >= len(page.text):
+        return page
+    log_verbose(f"      Smart extract: {page.url} {len(page.text):,} -> {len(text):,} chars")
+    return PageContent(url=page.url, title=page.title, text=text, raw_html=page.raw_html)
@@ -1,8 +1,9 @@
 """LangGraph workflow definition - V2.7 with Iterative Refinement."""
 
-from typing import TypedDict
+from typing import TypedDict, Dict, Any, AbstractSet
 from langgraph.graph import StateGraph, END
 from ..schema import ResearchState
+from ..config import llm_run_scope
 from .planner import planning_node
 from .supervisor import supervisor_node  # V2.0: Supervisor replaces researcher
 from .refinement import refinement_node  # V2.7: Targeted refinement
@@ -14,7 +15,25 @@ class GraphState(TypedDict):
     state: ResearchState
 
 
-def planning_wrapper(state: ResearchState) -> ResearchState:
+def _apply(state: ResearchState, updates: Dict[str, Any]) -> ResearchState:
+    """Apply a node's updates to the state in place.
+
+    Node outputs are already typed model instances, so a bulk ``__dict__``
+    update skips per-attribute ``setattr`` dispatch.
+
+    Args:
+        state: Current research state
+        updates: Field updates returned by a node
+
+    Returns:
+        The same research state, updated
+    """
+    if updates:  # Nodes that mutate in place return nothing to apply
+        state.__dict__.update(updates)
+    return state
+
+
+async def planning_wrapper(state: ResearchState) -> ResearchState:
     """Wrapper for planning node that updates state in place.
 
     Args:
@@ -23,16 +42,15 @@ def planning_wrapper(state: ResearchState) -> ResearchState:
     Returns:
         Updated research state
     """
-    updates = planning_node(state)
-    for k, v in updates.items():
-        setattr(state, k, v)
-    return state
+    updates = await planning_node(state)
+    return _apply(state, updates)
 
 
-def research_wrapper(state: ResearchState) -> ResearchState:
+async def research_wrapper(state: ResearchState) -> ResearchState:
     """Wrapper for supervisor node that updates state in place.
 
     V2.0: Uses supervisor that coordinates parallel sub-agents with reflection.
+    Sub-agents run as coroutines on the graph's event loop.
 
     Args:
         state: Current research state
@@ -40,16 +58,15 @@ def research_wrapper(state: ResearchState) -> ResearchState:
     Returns:
         Updated research state
     """
-    updates = supervisor_node(state)
-    for k, v in updates.items():
-        setattr(state, k, v)
-    return state
+    updates = await supervisor_node(state)
+    return _apply(state, updates)
 
 
-def refinement_wrapper(state: ResearchState) -> ResearchState:
+async def refinement_wrapper(state: ResearchState) -> ResearchState:
     """Wrapper for refinement node that updates state in place.
 
     V2.7: Executes targeted follow-up research to fill gaps.
+    Refinement sub-agents run as coroutines on the graph's event loop.
 
     Args:
         state: Current research state
@@ -57,13 +74,11 @@ def refinement_wrapper(state: ResearchState) -> ResearchState:
     Returns:
         Updated research state
     """
-    updates = refinement_node(state)
-    for k, v in updates.items():
-        setattr(state, k, v)
-    return state
+    updates = await refinement_node(state)
+    return _apply(state, updates)
 
 
-def writer_wrapper(state: ResearchState) -> ResearchState:
+async def writer_wrapper(state: ResearchState) -> ResearchState:
     """Wrapper for writer node that updates state in place.
 
     Args:
@@ -72,10 +87,26 @@ def writer_wrapper(state: ResearchState) -> ResearchState:
     Returns:
         Updated research state
     """
-    updates = writer_node(state)
-    for k, v in updates.items():
-        setattr(state, k, v)
-    return state
+    updates = await writer_node(state)
+    return _apply(state, updates)
+
+
+# Graph nodes: named module-level functions so they are built once and show
+# up by name in tracing, rather than fresh closures per build_graph() call.
+async def _plan(s: GraphState) -> GraphState:
+    return {"state": await planning_wrapper(s["state"])}
+
+
+async def _research(s: GraphState) -> GraphState:
+    return {"state": await research_wrapper(s["state"])}
+
+
+async def _refine(s: GraphState) -> GraphState:
+    return {"state": await refinement_wrapper(s["state"])}
+
+
+async def _write(s: GraphState) -> GraphState:
+    return {"state": await writer_wrapper(s["state"])}
 
 
 def should_refine(graph_state: GraphState) -> str:
@@ -99,7 +130,10 @@ def should_refine(graph_state: GraphState) -> str:
     return "write"
 
 
-def build_graph():
+DEFAULT_FEATURES = frozenset({"refinement"})
+
+
+def build_graph(features: AbstractSet[str] = DEFAULT_FEATURES):
     """Build the LangGraph workflow - V2.7 with Iterative Refinement.
 
     The workflow now includes conditional branching:
@@ -113,39 +147,67 @@ def build_graph():
 
     V2.0 Features (retained):
     - Research Supervisor coordinates multiple sub-agents
-    - Sub-agents work in parallel (ThreadPool)
+    - Sub-agents work in parallel (async tasks)
     - Each sub-agent has reflection/self-critique
     - Supervisor reviews all findings
 
+    Args:
+        features: Optional stages to include. With "refinement" omitted the
+            workflow is plan → research → write (the pre-V2.7 graph).
+
     Returns:
-        Compiled LangGraph application
+        Compiled LangGraph application (async - run it with ``run_graph``)
     """
     workflow = StateGraph(GraphState)
 
-    # Add nodes
-    workflow.add_node("plan", lambda s: {"state": planning_wrapper(s["state"])})
-    workflow.add_node("research", lambda s: {"state": research_wrapper(s["state"])})
-    workflow.add_node("refinement", lambda s: {"state": refinement_wrapper(s["state"])})
-    workflow.add_node("write", lambda s: {"state": writer_wrapper(s["state"])})
+    # Add nodes (async - run the compiled app with ``ainvoke``)
+    workflow.add_node("plan", _plan)
+    workflow.add_node("research", _research)
+    workflow.add_node("write", _write)
 
     # Define edges
     workflow.set_entry_point("plan")
     workflow.add_edge("plan", "research")
 
-    # Conditional edge: research → refinement OR write
-    workflow.add_conditional_edges(
-        "research",
-        should_refine,
-        {
-            "refinement": "refinement",
-            "write": "write"
-        }
-    )
-
-    # After refinement, always go to write
-    workflow.add_edge("refinement", "write")
+    if "refinement" in features:
+        workflow.add_node("refinement", _refine)
+
+        # Conditional edge: research → refinement OR write
+        workflow.add_conditional_edges(
+            "research",
+            should_refine,
+            {
+                "refinement": "refinement",
+                "write": "write"
+            }
+        )
+
+        # After refinement, always go to write
+        workflow.add_edge("refinement", "write")
+    else:
+        workflow.add_edge("research", "write")
+
     workflow.add_edge("write", END)
 
     # Compile and return
     app = workflow.compile()
     return app
+
+
+async def run_graph(app, state: ResearchState) -> ResearchState:
+    """Run a compiled workflow on a research state.
+
+    The run gets its own LLM clients and per-tier semaphores (see
+    ``config.llm_run_scope``), which are closed when it finishes, so
+    repeated runs on fresh event loops do not accumulate connection pools.
+
+    Args:
+        app: Compiled application from ``build_graph``
+        state: Initial research state
+
+    Returns:
+        Final research state
+    """
+    async with llm_run_scope():
+        final_state = await app.ainvoke({"state": state})
+    return final_state["state"]
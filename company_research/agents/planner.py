@@ -1,55 +1,40 @@
 """Planning agent for the Scope phase."""
 
-from typing import Dict, Any
+from operator import itemgetter
+from typing import Dict, Any, Tuple
 from langchain_core.prompts import ChatPromptTemplate
-from ..config import get_llm
-from ..schema import ClarifyWithUser, ResearchState, ResearchQuestion, AdaptiveQuestions
+from langchain_core.prompt_values import PromptValue
+from langchain_core.runnables import RunnableParallel
+from ..config import get_structured_llm, LLM_TEMPERATURE
+from ..storage import cache_key, load_cached, save_cached
+from ..schema import ResearchState, ResearchQuestion, AdaptiveQuestions
 from ..logger import (
-    log_phase, log_step, log_llm_call, log_verbose, log_tree,
-    log_success, Colors, Timer
+    log_phase, log_step, log_llm_call, log_tree,
+    log_success, log_lines, is_verbose, Colors, Timer
 )
 
 
-# Clarifier model and prompt
-clarify_model = get_llm().with_structured_output(ClarifyWithUser)
-
-CLARIFY_PROMPT = ChatPromptTemplate.from_messages([
-    (
-        "system",
-        "You are an AI research coordinator deciding whether a research request "
-        "needs clarification before starting.\n\n"
-        "CURRENT DATE: November 27, 2025\n\n"
-        "The user wants a deep research report about a specific company.\n"
-        "You must:\n"
-        "1. Decide if clarification is needed.\n"
-        "2. If needed, ask ONE clear question.\n"
-        "3. Provide a short confirmation message that research will begin after "
-        "the user answers.\n\n"
-        "IMPORTANT:\n"
-        "- In most cases, if the request clearly specifies company and focus "
-        "(e.g., 'COMPANY private markets report'), set need_clarification = false.\n"
-        "- Research will be restricted to a set of seed URLs and their domains."
-    ),
-    ("user", "{request}"),
-])
-
+# Static context shared by every planner system prompt. It leads each prompt
+# and all request-specific values go in the user message, so the leading
+# tokens are identical across calls and runs (provider prefix caching).
+PLANNER_PREAMBLE = (
+    "CURRENT DATE: November 27, 2025\n\n"
+    "You are part of a multi-agent deep research system that produces a "
+    "structured private-markets report about a single company. The system runs "
+    "many scraping / reading steps, organizes findings, then writes the report. "
+    "All research is restricted to the provided seed URLs and any additional "
+    "pages on the same domains.\n\n"
+)
 
-# Research brief model and prompt
-research_brief_model = get_llm().with_structured_output(ResearchQuestion)
 
+# Research brief prompt
 BRIEF_PROMPT = ChatPromptTemplate.from_messages([
     (
         "system",
+        PLANNER_PREAMBLE +
         "You are a senior research strategist. Your job is to turn a user "
-        "request into a single, clear research brief that will guide a "
-        "multi-agent deep research system.\n\n"
-        "CURRENT DATE: November 27, 2025\n\n"
-        "The system will:\n"
-        "- Run many scraping / reading steps over the provided URLs\n"
-        "- Organize findings\n"
-        "- Then write a structured report.\n\n"
-        "All research is restricted to the provided seed URLs and any additional "
-        "pages on the same domains."
+        "request into a single, clear research brief that will guide the "
+        "research system."
     ),
     (
         "user",
@@ -61,14 +46,29 @@ BRIEF_PROMPT = ChatPromptTemplate.from_messages([
 ])
 
 
-# V2.9: Adaptive questions generator
-adaptive_model = get_llm().with_structured_output(AdaptiveQuestions)
+# 6 CORE generic private-markets sub-questions, formatted per company.
+# The company name comes last so the leading text of each question (and the
+# sub-agent prompts built from it) is identical across companies, which keeps
+# provider prompt-prefix caching effective. The lead text says "the target"
+# rather than "the target company" so it does not trip the reflection
+# checklist rules (sub_agent._CHECKLIST_RULES). Keep the order stable - task
+# ids and cache keys depend on it.
+SUB_QUESTION_TEMPLATES = (
+    "Identify all key decision makers and leadership roles in the target's private investing / private markets activities. Target company: {company}.",
+    "Describe the regions and sectors in which the target is active in private markets. Target company: {company}.",
+    "Summarize any disclosed assets under management (AUM) or platform-level metrics for the target's private markets business. Target company: {company}.",
+    "List the private investing strategies, funds, and programs and explain their focus.",
+    "Summarize the portfolio / current firms the target is invested in, as disclosed in the scoped URLs. Target company: {company}.",
+    "Extract EVERY single news item and announcement related to the target's private markets activities. Include ALL fund closures, ALL portfolio company acquisitions/exits, ALL leadership appointments, ALL partnerships, ALL awards/recognitions, ALL press releases, and ALL other news items. Do not summarize - list each news item individually with its date and details. Target company: {company}.",
+)
 
+
+# V2.9: Adaptive questions generator
 ADAPTIVE_PROMPT = ChatPromptTemplate.from_messages([
     (
         "system",
+        PLANNER_PREAMBLE +
         "You are a research strategist generating ADAPTIVE sub-questions.\n\n"
-        "CURRENT DATE: November 27, 2025\n\n"
         "Context: A research system already has 6 CORE questions covering:\n"
         "1. Key decision makers/leadership\n"
         "2. Regions and sectors\n"
@@ -93,62 +93,113 @@ ADAPTIVE_PROMPT = ChatPromptTemplate.from_messages([
 ])
 
 
-def planning_node(state: ResearchState) -> Dict[str, Any]:
+def _research_brief_model():
+    """Structured research brief model, bound lazily on first use."""
+    return get_structured_llm(ResearchQuestion)
+
+
+def _adaptive_model():
+    """Structured adaptive questions model, bound lazily on first use."""
+    return get_structured_llm(AdaptiveQuestions)
+
+
+async def _planning_calls(
+    request: str,
+    company_name: str
+) -> Tuple[Dict[str, Any], Dict[str, PromptValue]]:
+    """Run the planning LLM calls as one parallel batch.
+
+    The brief and the adaptive questions depend only on the original request,
+    not on each other, so every step that is not served from the on-disk
+    response cache goes into a single ``RunnableParallel`` invocation.
+
+    Each prompt is rendered once; the same prompt values feed the models and
+    the log previews.
+
+    Args:
+        request: Original user request
+        company_name: Company being researched
+
+    Returns:
+        Tuple of (results keyed "brief" and "adaptive"; rendered prompt
+        values with the same keys)
+    """
+    inputs = {"request": request, "company_name": company_name}
+    prompt_values = {
+        "brief": BRIEF_PROMPT.invoke(inputs),
+        "adaptive": ADAPTIVE_PROMPT.invoke(inputs),
+    }
+    steps = {
+        "brief": itemgetter("brief") | _research_brief_model(),
+        "adaptive": itemgetter("adaptive") | _adaptive_model(),
+    }
+
+    # Responses are cached on disk, keyed by the prompt template and the
+    # normalized inputs (re-runs skip the LLM call)
+    normalized = request.strip().lower()
+    company_key = company_name.strip().lower()
+    cacheable = {
+        "brief": (
+            ResearchQuestion,
+            cache_key(repr(BRIEF_PROMPT.messages), company_key, normalized),
+        ),
+        "adaptive": (
+            AdaptiveQuestions,
+            cache_key(repr(ADAPTIVE_PROMPT.messages), company_key, normalized),
+        ),
+    }
+    # Only deterministic (zero-temperature) responses are cached
+    if LLM_TEMPERATURE != 0:
+        cacheable = {}
+
+    results: Dict[str, Any] = {}
+    for name, (schema, key) in cacheable.items():
+        hit = load_cached(name, key)
+        if hit is not None:
+            results[name] = schema.model_validate_json(hit)
+            del steps[name]
+
+    fresh = await RunnableParallel(steps).ainvoke(prompt_values)
+    for name, result in fresh.items():
+        if name in cacheable:
+            save_cached(name, cacheable[name][1], result.model_dump_json())
+    results.update(fresh)
+
+    return results, prompt_values
+
+
+async def planning_node(state: ResearchState) -> Dict[str, Any]:
     """Execute the planning phase.
 
     This node:
-    1. Checks if clarification is needed (non-interactive in this implementation)
-    2. Generates a research brief
-    3. Creates sub-questions for the research phase
+    1. Generates a research brief and adaptive sub-questions (both LLM calls
+       are dispatched concurrently)
+    2. Creates sub-questions for the research phase
 
     Args:
         state: Current research state
 
     Returns:
-        Dictionary with updated brief
+        Empty update dict - the brief is updated in place, so there is
+        nothing to re-assign on the state
     """
     log_phase(1, "PLANNING")
 
     request = state.brief.main_question
 
-    # Clarification step (non-interactive in this implementation)
-    log_step(f"{Colors.THINKING} Checking if clarification needed...", emoji="")
-    log_verbose(f"   Request: {request[:200]}...", indent=0)
-
-    with Timer("Clarification check"):
-        _clarify = (CLARIFY_PROMPT | clarify_model).invoke({"request": request})
-
-    # Get clarifier prompt for logging
-    clarify_prompt_text = CLARIFY_PROMPT.format(request=request)
-    log_llm_call(
-        purpose="Clarification Decision",
-        prompt_preview=clarify_prompt_text,
-        response_preview=f"need_clarification: {_clarify.need_clarification}",
-        truncate=300
-    )
-
-    if _clarify.need_clarification:
-        log_verbose(f"   Would ask: {_clarify.question}")
-    else:
-        log_success("No clarification needed", indent=1)
-
-    # Generate research brief
+    # Brief generation and adaptive questions are independent, so both LLM
+    # calls run concurrently
     log_step(f"\n{Colors.WRITE} Generating research sub-questions...", emoji="")
+    log_step(f"\n{Colors.TARGET} Generating adaptive sub-questions...", emoji="")
 
-    with Timer("Brief generation"):
-        rq = (BRIEF_PROMPT | research_brief_model).invoke({
-            "request": request,
-            "company_name": state.brief.company_name,
-        })
+    with Timer("Brief and adaptive questions generation"):
+        results, prompt_values = await _planning_calls(request, state.brief.company_name)
+    rq = results["brief"]
+    adaptive_result = results["adaptive"]
 
-    # Get brief prompt for logging
-    brief_prompt_text = BRIEF_PROMPT.format(
-        request=request,
-        company_name=state.brief.company_name
-    )
     log_llm_call(
         purpose="Research Brief Generation",
-        prompt_preview=brief_prompt_text,
+        prompt_preview=prompt_values["brief"].to_string() if is_verbose() else None,
         response_preview=rq.research_brief,
         truncate=500
     )
@@ -157,39 +208,30 @@ def planning_node(state: ResearchState) -> Dict[str, Any]:
 
     # Sub-questions – 6 CORE generic private-markets prompts
     core_questions = [
-        f"Identify all key decision makers and leadership roles in {state.brief.company_name}'s private investing / private markets activities.",
-        f"Describe the regions and sectors in which {state.brief.company_name} is active in private markets.",
-        f"Summarize any disclosed assets under management (AUM) or platform-level metrics for {state.brief.company_name}'s private markets business.",
-        f"List the private investing strategies, funds, and programs and explain their focus.",
-        f"Summarize the portfolio / current firms {state.brief.company_name} is invested in, as disclosed in the scoped URLs.",
-        f"Extract EVERY single news item and announcement related to {state.brief.company_name}'s private markets activities. Include ALL fund closures, ALL portfolio company acquisitions/exits, ALL leadership appointments, ALL partnerships, ALL awards/recognitions, ALL press releases, and ALL other news items. Do not summarize - list each news item individually with its date and details.",
+        t.format(company=state.brief.company_name) for t in SUB_QUESTION_TEMPLATES
     ]
 
-    # V2.9: Generate 2-3 ADAPTIVE questions based on request
-    log_step(f"\n{Colors.TARGET} Generating adaptive sub-questions...", emoji="")
-    with Timer("Adaptive questions generation"):
-        adaptive_result = (ADAPTIVE_PROMPT | adaptive_model).invoke({
-            "request": request,
-            "company_name": state.brief.company_name,
-        })
-
-    adaptive_prompt_text = ADAPTIVE_PROMPT.format(
-        request=request,
-        company_name=state.brief.company_name
-    )
+    # V2.9: 2-3 ADAPTIVE questions based on request (generated above)
     log_llm_call(
         purpose="Adaptive Questions Generation",
-        prompt_preview=adaptive_prompt_text,
+        prompt_preview=prompt_values["adaptive"].to_string() if is_verbose() else None,
         response_preview=f"{len(adaptive_result.questions)} adaptive questions",
         truncate=400
     )
 
     # Combine: 6 core + 2-3 adaptive = 8-9 total
     state.brief.sub_questions = core_questions + adaptive_result.questions
-
-    # Display all sub-questions
-    print(f"\n   {Colors.BOLD}Generated {len(state.brief.sub_questions)} Sub-Questions:{Colors.RESET}")
-    print(f"      {Colors.DIM}(6 core + {len(adaptive_result.questions)} adaptive){Colors.RESET}")
+    # Task ids are assigned once here; research and refinement look them up
+    state.brief.question_by_task_id = {
+        f"q_{idx}": q for idx, q in enumerate(state.brief.sub_questions)
+    }
+
+    # Display all sub-questions (buffered into a single write)
+    verbose = is_verbose()
+    lines = [
+        f"\n   {Colors.BOLD}Generated {len(state.brief.sub_questions)} Sub-Questions:{Colors.RESET}",
+        f"      {Colors.DIM}(6 core + {len(adaptive_result.questions)} adaptive){Colors.RESET}",
+    ]
     for idx, q in enumerate(state.brief.sub_questions, 1):
         # Mark adaptive questions
         is_adaptive = idx > 6
@@ -197,11 +239,12 @@ def planning_node(state: ResearchState) -> Dict[str, Any]:
 
         # Shorten for display
         short_q = q[:80] + "..." if len(q) > 80 else q
-        print(f"      {Colors.DIM}{idx}. {marker}{short_q}{Colors.RESET}")
+        lines.append(f"      {Colors.DIM}{idx}. {marker}{short_q}{Colors.RESET}")
         # Full question in verbose mode
-        if len(q) > 80:
-            log_verbose(f"         Full: {q}", indent=0)
+        if verbose and len(q) > 80:
+            lines.append(f"{Colors.DIM}         Full: {q}{Colors.RESET}")
+    log_lines(lines)
 
     log_success("\nPlanning Complete", indent=0)
 
-    return {"brief": state.brief}
+    return {}
@@ -1,21 +1,30 @@
 """Refinement node for targeted follow-up research."""
 
-from typing import Dict, Any, List
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import asyncio
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
-from ..schema import ResearchState, SubAgentTask, SubAgentResult
+from ..schema import ResearchState, SubAgentTask, SubAgentResult, findings_segments
 from ..scraping import CompanyScraper
-from .sub_agent import execute_sub_agent
+from .sub_agent import execute_sub_agent_async, build_context
 from ..mcp_search import execute_mcp_search
+from ..config import REFINE_MAX_WORKERS
 from ..logger import (
     log_phase, log_step, log_llm_call, log_verbose, log_success,
-    log_warning, log_metric, Colors, Timer, format_size
+    log_warning, log_info, log_lines, is_verbose, log_metric, Colors, Timer,
+    format_size
 )
 
 
+# Reflection confidence levels that warrant a refinement pass
+REFINE_CONFIDENCES = frozenset(("low", "medium"))
+
+
 def should_refine_task(result: SubAgentResult) -> bool:
     """Determine if a sub-agent task needs refinement.
 
+    A task is refined if it is marked incomplete, its confidence is low or
+    medium, or its reflection lists missing aspects (cheapest checks first).
+
     Args:
         result: Sub-agent result to evaluate
 
@@ -23,54 +32,62 @@ def should_refine_task(result: SubAgentResult) -> bool:
         True if refinement would be helpful
     """
     reflection = result.reflection
+    return (
+        not reflection.is_complete
+        or reflection.confidence in REFINE_CONFIDENCES
+        or bool(reflection.missing_aspects)
+    )
+
 
-    # Refine if marked as incomplete
-    if not reflection.is_complete:
-        return True
+def build_gap_description(original_result: SubAgentResult) -> str:
+    """Describe the gaps a sub-agent's reflection identified.
 
-    # Refine if confidence is low or medium
-    if reflection.confidence in ["low", "medium"]:
-        return True
+    Args:
+        original_result: Original sub-agent result with reflection
 
-    # Refine if there are missing aspects identified
-    if reflection.missing_aspects and len(reflection.missing_aspects) > 0:
-        return True
+    Returns:
+        Gap description used for MCP search and the refinement prompt
+    """
+    reflection = original_result.reflection
 
-    return False
+    gap_description = ""
+    if reflection.missing_aspects:
+        gap_description = f"Missing aspects: {', '.join(reflection.missing_aspects[:3])}"
+    if reflection.next_steps:
+        gap_description += f"\nSuggested next steps: {reflection.next_steps[:200]}"
+    return gap_description
 
 
 def create_refinement_task(
     original_result: SubAgentResult,
-    pages_list: List,
+    context_urls: List,
     company_name: str,
-    original_question: str
+    original_question: str,
+    mcp_result: Optional[Tuple[str, List[str]]] = None
 ) -> SubAgentTask:
     """Create a targeted refinement task based on gaps with MCP search.
 
     Args:
         original_result: Original sub-agent result with reflection
-        pages_list: List of available page content
+        context_urls: URLs of all available pages
         company_name: Company being researched
         original_question: Original research question text
+        mcp_result: Precomputed ``execute_mcp_search`` output; the search
+            runs here when omitted
 
     Returns:
         Refined SubAgentTask with focused instructions and MCP snippets
     """
-    reflection = original_result.reflection
-
-    # Build gap description
-    gap_description = ""
-    if reflection.missing_aspects:
-        gap_description = f"Missing aspects: {', '.join(reflection.missing_aspects[:3])}"
-    if reflection.next_steps:
-        gap_description += f"\nSuggested next steps: {reflection.next_steps[:200]}"
+    gap_description = build_gap_description(original_result)
 
     # V2.8: Execute MCP search to find targeted snippets
-    log_verbose(f"   Executing MCP search for {original_result.task_id}...")
-    targeted_snippets, patterns_used = execute_mcp_search(
-        gap_description=gap_description,
-        question=original_question
-    )
+    if mcp_result is None:
+        log_verbose(f"   Executing MCP search for {original_result.task_id}...")
+        mcp_result = execute_mcp_search(
+            gap_description=gap_description,
+            question=original_question
+        )
+    targeted_snippets, patterns_used = mcp_result
 
     # Log MCP search results
     if targeted_snippets:
@@ -83,9 +100,9 @@ def create_refinement_task(
     refined_task = SubAgentTask(
         task_id=f"{original_result.task_id}_refinement",
         question=original_result.task_id,  # Will be mapped to original question
-        context_urls=[p.url for p in pages_list],
+        context_urls=context_urls,
         is_refinement=True,
-        previous_findings=original_result.findings[:1000] + "...",  # Truncated preview
+        previous_findings=original_result.findings,  # Truncated when the prompt is built
         gap_to_address=gap_description,
         targeted_snippets=targeted_snippets if targeted_snippets else None,  # V2.8
         search_patterns_used=patterns_used  # V2.8
@@ -94,33 +111,50 @@ def create_refinement_task(
     return refined_task
 
 
-def merge_findings(original: str, refined: str) -> str:
-    """Merge original and refined findings.
+def merge_refined_result(
+    state: ResearchState,
+    ref_task_id: str,
+    refined_result: SubAgentResult
+) -> None:
+    """Merge one refinement result into its original result and note.
 
     Args:
-        original: Original findings
-        refined: Refined findings
-
-    Returns:
-        Merged findings text
+        state: Current research state (updated in place)
+        ref_task_id: Refinement task id ("<task_id>_refinement")
+        refined_result: Result of the refinement sub-agent
     """
-    return f"""{original}
+    # Extract original task_id from refinement task_id
+    original_task_id = ref_task_id.replace("_refinement", "")
+
+    if original_task_id not in state.sub_agent_results:
+        return
+
+    original_result = state.sub_agent_results[original_task_id]
+
+    # Merge findings (the persisted result carries the refined text too)
+    original_result.findings = "".join(
+        findings_segments(original_result.findings, [refined_result.findings])
+    )
 
----
-**REFINEMENT ADDENDUM:**
+    # Update reflection (use the more optimistic one)
+    if refined_result.reflection.confidence == "high":
+        original_result.reflection = refined_result.reflection
 
-{refined}
-"""
+    # Update note - appended as an addendum, joined when rendered
+    if original_task_id in state.notes:
+        state.notes[original_task_id].addenda.append(refined_result.findings)
 
+    log_verbose(f"   Merged {ref_task_id} → {original_task_id}")
 
-def refinement_node(state: ResearchState) -> Dict[str, Any]:
+
+async def refinement_node(state: ResearchState) -> Dict[str, Any]:
     """Execute refinement with targeted follow-up research.
 
     This node:
     1. Analyzes sub-agent reflections to identify gaps
     2. Creates targeted follow-up tasks for low-confidence results
     3. Re-runs specific sub-agents with focused prompts
-    4. Merges refined findings with original findings
+    4. Merges each refined result into the original as soon as it completes
     5. Updates notes and increments refinement counter
 
     Args:
@@ -153,99 +187,94 @@ def refinement_node(state: ResearchState) -> Dict[str, Any]:
     # Step 2: Create refinement tasks
     log_step(f"\n{Colors.TARGET} [2/3] Creating targeted follow-up tasks...", emoji="")
 
-    pages_list = list(state.pages.values())
+    # Page URLs are shared by every refinement task; sub-agents read the
+    # pages straight from the state dict's values view (no list copy)
+    context_urls = [p.url for p in state.pages.values()]
     refinement_tasks = []
     original_questions = {}  # Map refinement task_id to original question
 
-    for task_id, original_result in tasks_to_refine:
-        # Find original question from brief
-        original_question_idx = int(task_id.split('_')[1])  # Extract index from "q_0", "q_1", etc.
-        original_question = state.brief.sub_questions[original_question_idx]
-
-        # Create refinement task with MCP search
+    # Find original questions from brief
+    task_questions = [
+        state.brief.question_by_task_id[task_id] for task_id, _ in tasks_to_refine
+    ]
+
+    # V2.8: MCP searches are independent of each other, so run them all
+    # concurrently before assembling the tasks
+    log_verbose(f"   Executing {len(tasks_to_refine)} MCP searches in parallel...")
+    with Timer("MCP search"):
+        mcp_results = await asyncio.gather(*(
+            asyncio.to_thread(
+                execute_mcp_search,
+                gap_description=build_gap_description(original_result),
+                question=original_question
+            )
+            for (_, original_result), original_question in zip(tasks_to_refine, task_questions)
+        ))
+
+    verbose = is_verbose()
+    lines = []  # Task details, written in one go after the loop
+    for (task_id, original_result), original_question, mcp_result in zip(
+        tasks_to_refine, task_questions, mcp_results
+    ):
+        # Create refinement task from the MCP search results
         ref_task = create_refinement_task(
             original_result,
-            pages_list,
+            context_urls,
             state.brief.company_name,
-            original_question  # V2.8: Pass for MCP search
+            original_question,  # V2.8: Pass for MCP search
+            mcp_result=mcp_result
         )
         refinement_tasks.append(ref_task)
         original_questions[ref_task.task_id] = original_question
 
         # Log task details
         short_gap = ref_task.gap_to_address[:80] + "..." if len(ref_task.gap_to_address) > 80 else ref_task.gap_to_address
-        print(f"   {Colors.DIM}Refinement for {task_id}:{Colors.RESET}")
-        print(f"      {Colors.DIM}Gap: {short_gap}{Colors.RESET}")
+        lines.append(f"   {Colors.DIM}Refinement for {task_id}:{Colors.RESET}")
+        lines.append(f"      {Colors.DIM}Gap: {short_gap}{Colors.RESET}")
         if ref_task.search_patterns_used:
-            print(f"      {Colors.DIM}MCP Patterns: {', '.join(ref_task.search_patterns_used)}{Colors.RESET}")
-        if len(ref_task.gap_to_address) > 80:
-            log_verbose(f"         Full gap: {ref_task.gap_to_address}")
-
-    # Step 3: Execute refinement tasks in parallel
-    # V2.9: Increased from 2 to 3 workers for faster refinement
+            lines.append(f"      {Colors.DIM}MCP Patterns: {', '.join(ref_task.search_patterns_used)}{Colors.RESET}")
+        if verbose and len(ref_task.gap_to_address) > 80:
+            lines.append(f"{Colors.DIM}         Full gap: {ref_task.gap_to_address}{Colors.RESET}")
+    log_lines(lines)
+
+    # Step 3: Execute refinement tasks concurrently on the event loop
+    # Concurrency is bounded by REFINE_MAX_WORKERS (default 8)
+    max_workers = min(len(refinement_tasks), REFINE_MAX_WORKERS)
     log_step(f"\n{Colors.ROBOT} [3/3] Executing {len(refinement_tasks)} refinement tasks in parallel...", emoji="")
-    log_verbose(f"   ThreadPoolExecutor configured with max_workers=3 (refinement)")
+    log_info(f"Refinement concurrency: {max_workers} workers", indent=1)
+
+    # One unranked corpus context shared by every refinement task: each
+    # request then starts with an identical (provider-cacheable) prefix,
+    # and the MCP snippets carry the task-specific targeting
+    corpus_context = build_context(state.pages.values())
+    log_verbose(f"   Shared corpus context: {format_size(len(corpus_context))}")
 
     refined_results = {}
+    semaphore = asyncio.Semaphore(max_workers)
 
-    with Timer("Refinement Execution") as refinement_timer:
-        with ThreadPoolExecutor(max_workers=3) as executor:
-            # Submit refinement tasks
-            future_to_task = {
-                executor.submit(
-                    execute_sub_agent,
+    async def run_refinement(task: SubAgentTask) -> None:
+        async with semaphore:
+            try:
+                result = await execute_sub_agent_async(
                     task,
-                    pages_list,
+                    state.pages.values(),
                     state.brief.company_name,
-                    original_question=original_questions[task.task_id]
-                ): task
-                for task in refinement_tasks
-            }
-
-            log_verbose(f"   Submitted {len(future_to_task)} refinement tasks")
-
-            # Collect results
-            completed_count = 0
-            for future in as_completed(future_to_task):
-                task = future_to_task[future]
-                try:
-                    result = future.result()
-                    refined_results[task.task_id] = result
-                    completed_count += 1
-                    log_verbose(f"   ✓ {completed_count}/{len(refinement_tasks)} complete: {task.task_id}")
-                except Exception as e:
-                    log_warning(f"Refinement task {task.task_id} failed: {str(e)}", indent=1)
+                    original_question=original_questions[task.task_id],
+                    shared_context=corpus_context
+                )
+            except Exception as e:
+                log_warning(f"Refinement task {task.task_id} failed: {str(e)}", indent=1)
+                return
+        refined_results[task.task_id] = result
+        log_verbose(f"   ✓ {len(refined_results)}/{len(refinement_tasks)} complete: {task.task_id}")
+        # Merge as soon as each result arrives, while the others still run
+        merge_refined_result(state, task.task_id, result)
 
-    log_success(f"Completed {len(refined_results)}/{len(refinement_tasks)} refinements in {refinement_timer.elapsed():.1f}s", indent=1)
-
-    # Step 4: Merge refined findings with originals
-    print(f"\n   {Colors.WRITE} Merging refined findings with originals...")
-
-    for ref_task_id, refined_result in refined_results.items():
-        # Extract original task_id from refinement task_id
-        original_task_id = ref_task_id.replace("_refinement", "")
-
-        if original_task_id in state.sub_agent_results:
-            original_result = state.sub_agent_results[original_task_id]
-
-            # Merge findings
-            merged_findings = merge_findings(
-                original_result.findings,
-                refined_result.findings
-            )
-
-            # Update result with merged findings
-            original_result.findings = merged_findings
-
-            # Update reflection (use the more optimistic one)
-            if refined_result.reflection.confidence == "high":
-                original_result.reflection = refined_result.reflection
-
-            # Update note
-            if original_task_id in state.notes:
-                state.notes[original_task_id].content = merged_findings
+    with Timer("Refinement Execution") as refinement_timer:
+        log_verbose(f"   Submitted {len(refinement_tasks)} refinement tasks (merged into originals as they complete)")
+        await asyncio.gather(*(run_refinement(task) for task in refinement_tasks))
 
-            log_verbose(f"   Merged {ref_task_id} → {original_task_id}")
+    log_success(f"Completed {len(refined_results)}/{len(refinement_tasks)} refinements in {refinement_timer.elapsed():.1f}s", indent=1)
 
     # Increment refinement counter
     state.refinement_iteration = 1
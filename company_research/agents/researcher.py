@@ -1,11 +1,14 @@
 """Research agent for gathering and analyzing information."""
 
-from typing import Dict, Any, List
+import asyncio
+from typing import Dict, Any
 from langchain_core.prompts import ChatPromptTemplate
-from ..config import get_llm
-from ..schema import ResearchState, Note, PageContent
+from langchain_core.messages import SystemMessage
+from ..config import get_chain
+from ..schema import ResearchState, Note
 from ..scraping import CompanyScraper
 from ..storage import save_page
+from .context import build_context, select_relevant_pages
 
 
 RESEARCH_AGENT_SYSTEM = """
@@ -41,21 +44,25 @@ CITATION REQUIREMENTS:
 - Always list all URLs used at the end
 """
 
+# Shared context message - identical for every sub-question in a run, so it
+# leads the conversation and the provider can reuse the cached prefix
+RESEARCH_AGENT_CONTEXT = """
+Company: {company_name}
+
+CONTEXT: Today is November 27, 2025. Look for recent news from October and November 2025.
+
+Available context (complete markdown content from all seed URLs):
+{context}
+"""
+
 RESEARCH_AGENT_HUMAN = """
 Sub-question you must answer:
 
 {question}
 
-Company: {company_name}
-
-CONTEXT: Today is November 27, 2025. Look for recent news from October and November 2025.
-
 Existing notes on this topic (if any):
 {existing_notes}
 
-Available context (complete markdown content from all seed URLs):
-{context}
-
 CRITICAL INSTRUCTIONS:
 1. Read through ALL the provided context carefully, paying special attention to dates
 2. Extract EVERY relevant detail that answers the sub-question:
@@ -85,33 +92,20 @@ IMPORTANT: Be thorough and detailed. The goal is completeness, not brevity. Extr
 """
 
 RESEARCH_PROMPT = ChatPromptTemplate.from_messages([
-    ("system", RESEARCH_AGENT_SYSTEM),
+    SystemMessage(content=RESEARCH_AGENT_SYSTEM),
+    ("user", RESEARCH_AGENT_CONTEXT),
     ("user", RESEARCH_AGENT_HUMAN),
 ])
 
 
-def build_context(pages: List[PageContent]) -> str:
-    """Build context string from pages with complete markdown content.
-
-    Args:
-        pages: List of PageContent objects
-
-    Returns:
-        Formatted context string with complete content and URL references
-    """
-    chunks = []
-    for i, p in enumerate(pages, start=1):
-        # Include COMPLETE markdown text - no truncation
-        chunks.append(f"=== SOURCE [{i}] ===\nURL: {p.url}\nTitle: {p.title}\n\n{p.text}\n")
-    return "\n\n" + "="*80 + "\n\n".join(chunks)
-
-
-def research_node(state: ResearchState) -> Dict[str, Any]:
+async def research_node(state: ResearchState) -> Dict[str, Any]:
     """Execute the research phase.
 
     This node:
     1. Fetches all seed URLs
     2. For each sub-question, generates a research note using the LLM
+       from the pages relevant to it (all questions are sent concurrently
+       as one async batch on the caller's event loop)
 
     Args:
         state: Current research state
@@ -119,47 +113,52 @@ def research_node(state: ResearchState) -> Dict[str, Any]:
     Returns:
         Dictionary with updated notes and pages
     """
-    llm = get_llm()
     scraper = CompanyScraper(brief=state.brief)
 
-    # 1) Fetch all seed URLs
-    for url in state.brief.seed_urls:
-        url_str = str(url)
-        if url_str not in state.pages:
-            try:
-                page = scraper.fetch(url_str)
-                state.pages[url_str] = page
-                save_page(page)
-            except Exception as e:
-                print(f"Warning: Failed to fetch {url_str}: {str(e)}")
-                continue
+    # 1) Fetch all seed URLs (concurrently)
+    to_fetch = [str(url) for url in state.brief.seed_urls if str(url) not in state.pages]
+    fetched = await asyncio.to_thread(scraper.fetch_many, to_fetch)
+    for url_str, page in fetched.items():
+        if isinstance(page, Exception):
+            print(f"Warning: Failed to fetch {url_str}: {str(page)}")
+            continue
+        state.pages[url_str] = page
+        save_page(page)
 
     pages_list = list(state.pages.values())
-    context = build_context(pages_list)
     notes = state.notes.copy()
 
     # 2) For each sub-question, write a research note
-    for idx, q in enumerate(state.brief.sub_questions):
-        q_id = f"q_{idx}"
-        if q_id in notes:
-            continue
-
-        existing_notes = ""  # can aggregate related notes if needed
-
-        resp = (RESEARCH_PROMPT | llm).invoke({
-            "question": q,
-            "company_name": state.brief.company_name,
-            "existing_notes": existing_notes,
-            "context": context,
-        })
-
-        content = resp.content
-        sources = [p.url for p in pages_list]  # simple initial heuristic
-
+    # The calls are independent, so all pending questions go out as one batch
+    pending = [
+        (f"q_{idx}", q)
+        for idx, q in enumerate(state.brief.sub_questions)
+        if f"q_{idx}" not in notes
+    ]
+
+    existing_notes = ""  # can aggregate related notes if needed
+
+    # Each question only sees the pages relevant to it
+    selected_pages = [select_relevant_pages(pages_list, q) for _, q in pending]
+
+    responses = await get_chain(RESEARCH_PROMPT).abatch(
+        [
+            {
+                "question": q,
+                "company_name": state.brief.company_name,
+                "existing_notes": existing_notes,
+                "context": build_context(selected, question=q),
+            }
+            for (_, q), selected in zip(pending, selected_pages)
+        ],
+        config={"max_concurrency": 8},
+    )
+
+    for (q_id, _), selected, resp in zip(pending, selected_pages, responses):
         notes[q_id] = Note(
             question_id=q_id,
-            content=content,
-            sources=sources,
+            content=resp.content,
+            sources=[p.url for p in selected],
         )
 
     state.notes = notes
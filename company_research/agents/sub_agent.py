@@ -1,10 +1,36 @@
 """Sub-agent for specialized research with reflection capabilities."""
 
-from typing import List
+import re
+import json
+import time
+import asyncio
+from io import StringIO
+from typing import (
+    Dict, Any, List, Tuple, Union, Collection, Optional, AsyncIterable,
+    Awaitable, Callable
+)
 from langchain_core.prompts import ChatPromptTemplate
-from ..config import get_llm
-from ..schema import SubAgentTask, SubAgentResult, Reflection, PageContent
-from ..logger import log_verbose, log_llm_call, format_size, Colors
+from langchain_core.messages import SystemMessage
+from ..config import (
+    get_chain, get_llm_semaphore, LLM_TEMPERATURE,
+    RESEARCH_IDLE_TIMEOUT, RESEARCH_TIMEOUT, REFLECTION_TIMEOUT, LLM_CALL_ATTEMPTS,
+    BATCH_REFLECTIONS, REFLECTION_BATCH_SIZE, MODEL_TIERS, SKIP_CONFIDENT_REFLECTION,
+    SUB_AGENT_MAX_CONCURRENCY, BATCH_SUB_AGENT_QUESTIONS, BATCHED_QUESTIONS_MAX,
+    BATCHED_CONTEXT_MAX_CHARS
+)
+from ..schema import (
+    SubAgentTask, SubAgentResult, Reflection, ReflectionBatch, PageContent, BatchedFindings
+)
+from ..storage import cache_key, load_cached, save_cached
+from ..mcp_search import extract_dates
+from ..logger import (
+    log_verbose, log_lines, log_llm_call, log_warning, format_size, truncate_text,
+    is_verbose, Colors
+)
+# Context helpers live in .context; re-exported for existing importers
+from .context import (
+    build_context, extract_keywords, calculate_page_relevance, select_relevant_pages
+)
 
 
 # Sub-agent research prompt
@@ -73,14 +99,18 @@ DATE EXTRACTION (CRITICAL FOR NEWS):
 IMPORTANT: You are THE expert on this specific question. Go deep.
 """
 
-SUB_AGENT_HUMAN = """
-Your specialized research question:
-{question}
-
+# Context leads, ahead of the task-specific question, so requests that
+# share a context also share a provider-cacheable prompt prefix
+SUB_AGENT_CONTEXT = """
 Company: {company_name}
 
 Complete context from all available sources:
 {context}
+"""
+
+SUB_AGENT_HUMAN = """
+Your specialized research question:
+{question}
 
 TASK:
 1. Read through ALL context carefully
@@ -101,7 +131,8 @@ Be comprehensive and thorough. This is your specialty - extract everything.
 """
 
 SUB_AGENT_PROMPT = ChatPromptTemplate.from_messages([
-    ("system", SUB_AGENT_SYSTEM),
+    SystemMessage(content=SUB_AGENT_SYSTEM),
+    ("user", SUB_AGENT_CONTEXT),
     ("user", SUB_AGENT_HUMAN),
 ])
 
@@ -121,6 +152,13 @@ Your role:
 Be honest and critical - better to catch gaps now than in the final report.
 """
 
+# The context sample leads, ahead of the task-specific question and
+# findings, so reflections over the same context share a prompt prefix
+REFLECTION_CONTEXT = """
+Original context sample (first 2000 chars):
+{context_sample}
+"""
+
 REFLECTION_HUMAN = """
 Research question:
 {question}
@@ -128,9 +166,6 @@ Research question:
 Findings:
 {findings}
 
-Original context sample (first 2000 chars):
-{context_sample}
-
 REFLECTION TASK:
 1. Is the research complete and thorough?
 2. What aspects might be missing or need more detail?
@@ -143,11 +178,93 @@ Be critical and thorough in your assessment.
 """
 
 REFLECTION_PROMPT = ChatPromptTemplate.from_messages([
-    ("system", REFLECTION_SYSTEM),
+    SystemMessage(content=REFLECTION_SYSTEM),
+    ("user", REFLECTION_CONTEXT),
     ("user", REFLECTION_HUMAN),
 ])
 
 
+# Leading slice of the context shown to reflection (matches the
+# "first 2000 chars" note in REFLECTION_HUMAN)
+CONTEXT_SAMPLE_CHARS = 2000
+
+
+# Verbose mode reports streamed research progress every this many chars
+STREAM_PROGRESS_CHARS = 4000
+
+
+# Reflection is a short structured critique; it runs on the small model
+REFLECTION_TIER = "small"
+
+
+# Opt-in batched reflection: several tasks' findings in one structured call
+REFLECTION_BATCH_ITEM = """
+=== ITEM {index} ===
+Research question:
+{question}
+
+Findings:
+{findings}
+
+Original context sample (first 2000 chars):
+{context_sample}
+
+{question_specific_checklist}
+"""
+
+REFLECTION_BATCH_HUMAN = """
+Below are the findings of {count} research sub-agents. Review each item
+independently, exactly as you would a single set of findings:
+1. Is the research complete and thorough?
+2. What aspects might be missing or need more detail?
+3. What's your confidence level? (high/medium/low)
+4. What should be done next to improve these findings?
+
+{items}
+
+Return exactly {count} assessments, one per item, in item order.
+Be critical and thorough in your assessment.
+"""
+
+REFLECTION_BATCH_PROMPT = ChatPromptTemplate.from_messages([
+    SystemMessage(content=REFLECTION_SYSTEM),
+    ("user", REFLECTION_BATCH_HUMAN),
+])
+
+
+# Opt-in batched research: several questions over one shared context. The
+# system and context messages match SUB_AGENT_PROMPT, so the prefix is shared
+BATCHED_SUB_AGENT_HUMAN = """
+You have been assigned {count} research questions. Answer each one
+independently, exactly as you would a single question:
+
+{questions}
+
+TASK (for EACH question):
+1. Read through ALL context carefully
+2. Extract EVERY relevant detail that answers the question
+3. For NEWS/ANNOUNCEMENTS: Search aggressively for precise dates in all formats (ISO dates, written dates, timestamps)
+4. Organize findings clearly (use bullet points, lists, sections)
+5. Include inline citation [1], [2] after EVERY fact
+6. At the end of each answer, list the URLs you cited
+7. Note any aspects the sources do not answer
+
+Return exactly {count} answers, one per question, using each question's ID.
+Do not shorten an answer because there are several - each is a specialty.
+"""
+
+BATCHED_SUB_AGENT_PROMPT = ChatPromptTemplate.from_messages([
+    SystemMessage(content=SUB_AGENT_SYSTEM),
+    ("user", SUB_AGENT_CONTEXT),
+    ("user", BATCHED_SUB_AGENT_HUMAN),
+])
+
+
+# Previous findings shown to a refinement pass are cut to this many chars,
+# at a word boundary
+PREVIOUS_FINDINGS_CHARS = 1000
+
+
 # V2.7: Refinement prompt for targeted follow-up
 REFINEMENT_SYSTEM = """
 You are a specialized research sub-agent conducting TARGETED FOLLOW-UP research.
@@ -186,9 +303,6 @@ IDENTIFIED GAP TO ADDRESS:
 
 {targeted_snippets_section}
 
-Complete context from all available sources:
-{context}
-
 REFINEMENT TASK:
 1. Review your previous findings above
 2. {mcp_instruction}
@@ -200,28 +314,23 @@ REFINEMENT TASK:
 What new information can you find to address the gap?
 """
 
+# The corpus context leads the conversation, ahead of anything task-specific:
+# refinement tasks share one unranked corpus context, so every refinement
+# request starts with the same prefix and the provider can cache it.
+REFINEMENT_CONTEXT = """
+Complete context from all available sources:
+{context}
+"""
+
 REFINEMENT_PROMPT = ChatPromptTemplate.from_messages([
-    ("system", REFINEMENT_SYSTEM),
+    SystemMessage(content=REFINEMENT_SYSTEM),
+    ("user", REFINEMENT_CONTEXT),
     ("user", REFINEMENT_HUMAN),
 ])
 
 
-def get_reflection_checklist(question: str) -> str:
-    """Generate question-type-specific reflection checklist.
-
-    V2.9: Enhanced reflection with targeted checklists for quality
-
-    Args:
-        question: The research question
-
-    Returns:
-        Formatted checklist string for reflection prompt
-    """
-    question_lower = question.lower()
-
-    # NEWS/ANNOUNCEMENTS CHECKLIST
-    if any(word in question_lower for word in ["news", "announcement", "press release"]):
-        return """
+# Question-type reflection checklists (V2.9), picked by get_reflection_checklist
+NEWS_CHECKLIST = """
 CRITICAL CHECKLIST FOR NEWS QUESTIONS:
 ☐ Did you count all news items? How many did you extract? (5? 10? 20?)
 ☐ Did you search ALL sources for: fund closures, acquisitions, exits, appointments, partnerships, awards, surveys, press releases?
@@ -237,9 +346,7 @@ CRITICAL CHECKLIST FOR NEWS QUESTIONS:
 ☐ Are you CERTAIN there aren't more news items you missed?
 """
 
-    # PEOPLE/LEADERSHIP CHECKLIST
-    elif any(word in question_lower for word in ["decision maker", "leadership", "team", "people", "executive"]):
-        return """
+PEOPLE_CHECKLIST = """
 CRITICAL CHECKLIST FOR PEOPLE/LEADERSHIP QUESTIONS:
 ☐ Did you extract EVERY name mentioned across ALL pages?
 ☐ Did EVERY person have a complete title/position?
@@ -254,9 +361,7 @@ CRITICAL CHECKLIST FOR PEOPLE/LEADERSHIP QUESTIONS:
 ☐ Did you check for Advisory Board or Board of Directors separately?
 """
 
-    # PORTFOLIO/COMPANIES CHECKLIST
-    elif any(word in question_lower for word in ["portfolio", "compan", "invest", "firm"]):
-        return """
+PORTFOLIO_CHECKLIST = """
 CRITICAL CHECKLIST FOR PORTFOLIO/COMPANIES QUESTIONS:
 ☐ Did you count how many companies you extracted?
 ☐ Did you search ALL sources including: portfolio pages, case studies, press releases, news items?
@@ -271,9 +376,7 @@ CRITICAL CHECKLIST FOR PORTFOLIO/COMPANIES QUESTIONS:
 ☐ Are you CERTAIN you didn't miss any companies mentioned in the sources?
 """
 
-    # AUM/FINANCIAL METRICS CHECKLIST
-    elif any(word in question_lower for word in ["aum", "assets under management", "fund size", "capital"]):
-        return """
+FINANCIAL_CHECKLIST = """
 CRITICAL CHECKLIST FOR FINANCIAL METRICS QUESTIONS:
 ☐ Did you find specific dollar amounts? ($500M, $2.5B, etc.)
 ☐ Did you find percentages? (ownership stakes, returns, growth rates)
@@ -285,9 +388,7 @@ CRITICAL CHECKLIST FOR FINANCIAL METRICS QUESTIONS:
 ☐ Did you note if metrics are "as of" a specific date?
 """
 
-    # STRATEGY/FUNDS CHECKLIST
-    elif any(word in question_lower for word in ["strateg", "fund", "program"]):
-        return """
+STRATEGY_CHECKLIST = """
 CRITICAL CHECKLIST FOR STRATEGY/FUNDS QUESTIONS:
 ☐ Did you list EVERY fund/strategy mentioned by name?
 ☐ For each strategy, did you extract:
@@ -301,9 +402,7 @@ CRITICAL CHECKLIST FOR STRATEGY/FUNDS QUESTIONS:
 ☐ Did you check for vintage/launch dates?
 """
 
-    # GENERIC CHECKLIST
-    else:
-        return """
+GENERIC_CHECKLIST = """
 CRITICAL CHECKLIST:
 ☐ Did you extract ALL relevant information from ALL sources?
 ☐ Did you use specific details (names, dates, numbers) rather than summaries?
@@ -312,133 +411,78 @@ CRITICAL CHECKLIST:
 ☐ Did you use inline citations [1], [2], [3] for every fact?
 """
 
+# (question pattern, checklist) in priority order; the first pattern found
+# anywhere in the question picks the checklist
+_NEWS_QUESTION_RE = re.compile(r"news|announcement|press release", re.IGNORECASE)
+_CHECKLIST_RULES = [
+    (_NEWS_QUESTION_RE, NEWS_CHECKLIST),
+    (re.compile(r"decision maker|leadership|team|people|executive", re.IGNORECASE), PEOPLE_CHECKLIST),
+    (re.compile(r"portfolio|compan|invest|firm", re.IGNORECASE), PORTFOLIO_CHECKLIST),
+    (re.compile(r"aum|assets under management|fund size|capital", re.IGNORECASE), FINANCIAL_CHECKLIST),
+    (re.compile(r"strateg|fund|program", re.IGNORECASE), STRATEGY_CHECKLIST),
+]
 
-def extract_keywords(question: str) -> List[str]:
-    """Extract key terms from question for relevance ranking.
+# Trailing "Target company: <name>." clause of the core sub-questions
+# (planner.SUB_QUESTION_TEMPLATES); the name itself (e.g. "... Capital") must
+# not pick the checklist
+_TARGET_CLAUSE_RE = re.compile(r"\s*Target company:[^\n]*$")
 
-    V2.9: Helper for smart context building
-
-    Args:
-        question: Research question
-
-    Returns:
-        List of keywords to look for
-    """
-    keywords = []
-    question_lower = question.lower()
 
-    # Question-type keywords
-    if "news" in question_lower or "announcement" in question_lower:
-        keywords.extend(["news", "announcement", "press release", "announced", "partnership", "acquisition", "fund closure", "appointment", "award"])
-    if "decision maker" in question_lower or "leadership" in question_lower or "team" in question_lower:
-        keywords.extend(["team", "leadership", "partner", "director", "executive", "ceo", "cfo", "cto", "management", "our team"])
-    if "portfolio" in question_lower or "companies" in question_lower or "invest" in question_lower:
-        keywords.extend(["portfolio", "investment", "company", "companies", "case study", "exits", "acquisition"])
-    if "aum" in question_lower or "assets" in question_lower:
-        keywords.extend(["aum", "assets under management", "billion", "million", "capital", "fund size"])
-    if "strategy" in question_lower or "fund" in question_lower:
-        keywords.extend(["strategy", "fund", "approach", "focus", "program", "venture", "growth", "stage"])
-    if "region" in question_lower or "sector" in question_lower:
-        keywords.extend(["region", "sector", "industry", "geography", "market", "focus area"])
-
-    return keywords
-
-
-def calculate_page_relevance(page: PageContent, keywords: List[str]) -> float:
-    """Calculate relevance score for a page based on keywords.
-
-    V2.9: Used for smart context ranking
-
-    Args:
-        page: Page content
-        keywords: List of keywords to search for
-
-    Returns:
-        Relevance score (higher is more relevant)
-    """
-    if not keywords:
-        return 1.0  # No keywords = equal relevance
-
-    text_lower = (page.title + " " + page.text).lower()
-    score = 0.0
-
-    for keyword in keywords:
-        # Count occurrences (normalized by text length to favor density over volume)
-        count = text_lower.count(keyword.lower())
-        if count > 0:
-            # Title matches worth more
-            if keyword.lower() in page.title.lower():
-                score += 5.0
-            # Content matches
-            score += count * (1000.0 / max(len(text_lower), 1000))  # Normalize by text length
-
-    return score
-
-
-def build_context(pages: List[PageContent], question: str = None) -> str:
-    """Build context string from pages with smart relevance ranking.
+def get_reflection_checklist(question: str) -> str:
+    """Generate question-type-specific reflection checklist.
 
-    V2.9: Pages are ranked by keyword relevance to question,
-    with most relevant pages placed first for better LLM attention.
+    V2.9: Enhanced reflection with targeted checklists for quality
 
     Args:
-        pages: List of PageContent objects
-        question: Research question (optional, for smart ranking)
+        question: The research question
 
     Returns:
-        Formatted context string with content ranked by relevance
+        Formatted checklist string for reflection prompt
     """
-    # Smart ranking if question provided
-    if question:
-        keywords = extract_keywords(question)
-        if keywords:
-            # Calculate relevance and sort
-            pages_with_scores = [(p, calculate_page_relevance(p, keywords)) for p in pages]
-            pages_with_scores.sort(key=lambda x: x[1], reverse=True)
-            sorted_pages = [p for p, score in pages_with_scores]
-
-            log_verbose(f"      Context ranking: Using {len(keywords)} keywords to rank {len(pages)} pages")
-        else:
-            sorted_pages = pages
-    else:
-        sorted_pages = pages
+    question = _TARGET_CLAUSE_RE.sub("", question)
+    for pattern, checklist in _CHECKLIST_RULES:
+        if pattern.search(question):
+            return checklist
+    return GENERIC_CHECKLIST
 
-    # Build context with ranked pages
-    chunks = []
-    for i, p in enumerate(sorted_pages, start=1):
-        chunks.append(f"=== SOURCE [{i}] ===\nURL: {p.url}\nTitle: {p.title}\n\n{p.text}\n")
-    return "\n\n" + "="*80 + "\n\n".join(chunks)
 
-
-def execute_sub_agent(
+def _research_inputs(
     task: SubAgentTask,
-    pages: List[PageContent],
+    pages: Collection[PageContent],
     company_name: str,
-    original_question: str = None
-) -> SubAgentResult:
-    """Execute a sub-agent research task with reflection.
+    original_question: str = None,
+    shared_context: Optional[str] = None
+) -> Tuple[ChatPromptTemplate, Dict[str, Any], str, str, List[PageContent]]:
+    """Build the research (or refinement) prompt inputs for a task.
 
     Args:
         task: The research task assignment
-        pages: All available page content
+        pages: Pages ``shared_context`` was built from, or all available
+            pages to select the task's own context from
         company_name: Name of the company being researched
         original_question: Original question text (for refinement tasks)
+        shared_context: Context prebuilt by the caller (possibly shared
+            across tasks); a per-task ranked context is built when omitted
 
     Returns:
-        SubAgentResult with findings and reflection
+        Tuple of (prompt, prompt inputs, prompt preview for logging, context
+        sample for reflection, pages the context was built from); the
+        preview is only rendered in verbose mode (empty otherwise)
     """
-    llm = get_llm()
-    reflection_llm = get_llm().with_structured_output(Reflection)
-
-    # Build context from all pages with smart ranking
-    # V2.9: Context now ranked by keyword relevance to question
-    log_verbose(f"   Building context for {task.task_id}...")
-    question_for_context = original_question if task.is_refinement and original_question else task.question
-    context = build_context(pages, question=question_for_context)
+    if shared_context is not None:
+        context = shared_context
+        context_pages = list(pages)
+        log_verbose(f"   Using prebuilt context for {task.task_id}")
+    else:
+        # Build context from all pages with smart ranking
+        # V2.9: Context now ranked by keyword relevance to question
+        log_verbose(f"   Building context for {task.task_id}...")
+        question_for_context = original_question if task.is_refinement and original_question else task.question
+        context_pages = select_relevant_pages(pages, question_for_context)
+        context = build_context(context_pages, question=question_for_context)
     context_size = len(context)
-    log_verbose(f"      Context size: {format_size(context_size)} from {len(pages)} pages")
+    log_verbose(f"      Context size: {format_size(context_size)} from {len(context_pages)} pages")
 
-    # Step 1: Research - Sub-agent analyzes content
     if task.is_refinement:
         print(f"  → Sub-agent REFINING: {task.task_id}")
         log_verbose(f"      Mode: Targeted refinement (second-pass)")
@@ -463,94 +507,491 @@ These are the MOST LIKELY locations of the missing information.
 
         # Use refinement prompt
         question_text = original_question if original_question else task.question
-        research_prompt_text = REFINEMENT_PROMPT.format(
-            question=question_text,
-            company_name=company_name,
-            previous_findings=task.previous_findings,
-            gap_to_address=task.gap_to_address,
-            targeted_snippets_section=targeted_snippets_section,
-            mcp_instruction=mcp_instruction,
-            context=context[:500] + "..."
-        )
-
-        research_response = (REFINEMENT_PROMPT | llm).invoke({
+        inputs = {
             "question": question_text,
             "company_name": company_name,
-            "previous_findings": task.previous_findings,
+            "previous_findings": truncate_text(
+                task.previous_findings or "", PREVIOUS_FINDINGS_CHARS, at_word=True
+            ),
             "gap_to_address": task.gap_to_address,
             "targeted_snippets_section": targeted_snippets_section,
             "mcp_instruction": mcp_instruction,
             "context": context,
-        })
+        }
+        prompt = REFINEMENT_PROMPT
     else:
         print(f"  → Sub-agent working on: {task.task_id}")
         log_verbose(f"      Mode: Initial research (first-pass)")
 
         # Use regular prompt
-        research_prompt_text = SUB_AGENT_PROMPT.format(
-            question=task.question,
-            company_name=company_name,
-            context=context[:500] + "..."
-        )
-
-        research_response = (SUB_AGENT_PROMPT | llm).invoke({
+        inputs = {
             "question": task.question,
             "company_name": company_name,
             "context": context,
-        })
+        }
+        prompt = SUB_AGENT_PROMPT
+
+    # The preview is only shown by log_llm_call in verbose mode
+    prompt_preview = ""
+    if is_verbose():
+        prompt_preview = prompt.format(**{**inputs, "context": context[:500] + "..."})
+    # Only the sample is kept past the research call, so the full context
+    # is not held while reflection runs
+    return prompt, inputs, prompt_preview, context[:CONTEXT_SAMPLE_CHARS], context_pages
+
+
+def _response_cache_key(
+    prompt: ChatPromptTemplate,
+    inputs: Dict[str, Any],
+    tier: str = "default"
+) -> Optional[str]:
+    """Key an LLM call on its prompt template and every prompt input.
+
+    Research inputs include the full context, so a key only matches when
+    the same question is asked of the same content; reflection inputs
+    include the findings being critiqued.
+
+    Args:
+        prompt: Research, refinement or reflection prompt
+        inputs: Prompt inputs (from ``_research_inputs`` or
+            ``_reflection_inputs``)
+        tier: Model tier answering the call (its model is part of the key)
+
+    Returns:
+        Cache key, or None when responses are not deterministic
+    """
+    # Only deterministic (zero-temperature) responses are cached
+    if LLM_TEMPERATURE != 0:
+        return None
+    return cache_key(
+        MODEL_TIERS[tier], repr(prompt.messages), *(f"{k}={inputs[k]}" for k in sorted(inputs))
+    )
+
 
-    findings = research_response.content
+def _load_findings(task: SubAgentTask, key: Optional[str]) -> Optional[str]:
+    """Return cached findings for a research call, if any.
+
+    Args:
+        task: The research task assignment
+        key: Key from ``_response_cache_key``
+
+    Returns:
+        Cached findings text, or None on a miss
+    """
+    cached = load_cached("findings", key) if key else None
+    if cached is None:
+        return None
+    log_verbose(f"      Findings for {task.task_id} loaded from cache")
+    return json.loads(cached)
+
+
+def _load_reflection(task: SubAgentTask, key: Optional[str]) -> Optional[Reflection]:
+    """Return a cached reflection for a task's findings, if any.
+
+    Args:
+        task: The research task assignment
+        key: Key from ``_response_cache_key``
+
+    Returns:
+        Cached Reflection, or None on a miss
+    """
+    cached = load_cached("reflections", key) if key else None
+    if cached is None:
+        return None
+    log_verbose(f"      Reflection for {task.task_id} loaded from cache")
+    return Reflection.model_validate_json(cached)
+
+
+class _StreamProgress:
+    """Verbose-mode progress for a streamed research response.
+
+    Reports time to first token once, then a line for every
+    ``STREAM_PROGRESS_CHARS`` received, so long decodes show up in the
+    console (and the Streamlit log) while they run.
+    """
 
+    def __init__(self, task: SubAgentTask):
+        self.task_id = task.task_id
+        self.enabled = is_verbose()
+        self.start = time.perf_counter()
+        self.received = 0
+        self.next_report = STREAM_PROGRESS_CHARS
+
+    def update(self, text: str) -> None:
+        if not self.enabled or not text:
+            return
+        if self.received == 0:
+            log_verbose(f"      {self.task_id}: first tokens after {time.perf_counter() - self.start:.1f}s")
+        self.received += len(text)
+        if self.received >= self.next_report:
+            log_verbose(f"      {self.task_id}: {format_size(self.received)} received...")
+            self.next_report += STREAM_PROGRESS_CHARS
+
+
+async def _acollect_stream(
+    chunks: AsyncIterable,
+    task: SubAgentTask,
+    idle_timeout: Optional[float] = None
+) -> str:
+    """Concatenate streamed message chunks into the full response text.
+
+    Args:
+        chunks: Message chunks from ``runnable.astream``
+        task: Task the response belongs to (for progress logging)
+        idle_timeout: Seconds allowed for the first chunk and between
+            chunks (no limit when None); total decode time is not capped
+
+    Returns:
+        Full response text
+
+    Raises:
+        asyncio.TimeoutError: If the stream stalls for ``idle_timeout``
+    """
+    buffer = StringIO()
+    progress = _StreamProgress(task)
+    stream = aiter(chunks)
+    while True:
+        try:
+            chunk = await asyncio.wait_for(anext(stream), idle_timeout)
+        except StopAsyncIteration:
+            break
+        buffer.write(chunk.content)
+        progress.update(chunk.content)
+    return buffer.getvalue()
+
+
+async def _call_with_timeout(
+    call: Callable[[], Awaitable[Any]],
+    timeout: float,
+    label: str,
+    tier: str = "default",
+    idle: bool = False
+) -> Any:
+    """Await an LLM call with a wall-clock timeout and bounded retry.
+
+    Each attempt first takes a slot from the tier's semaphore, so in-flight
+    calls stay under the provider rate limit however many sub-agents run.
+    A call still running after ``timeout`` seconds is cancelled and started
+    again (after a short backoff), so one stuck request cannot stall a
+    whole batch of sub-agents. Gives up after ``LLM_CALL_ATTEMPTS``.
+
+    Args:
+        call: Starts the call; invoked once per attempt
+        timeout: Seconds allowed per attempt (excluding time queued)
+        label: Call description for the retry warning and the error
+        tier: Model tier the call goes to
+        idle: The call is a stream that enforces ``timeout`` itself as the
+            longest wait for a chunk (see ``_acollect_stream``), so the
+            attempt as a whole is not capped
+
+    Returns:
+        Result of the call
+
+    Raises:
+        TimeoutError: Naming the call, tier and limit, if every attempt
+            timed out
+    """
+    limit = f"{timeout:.0f}s {'without output' if idle else 'in total'}"
+    for attempt in range(1, LLM_CALL_ATTEMPTS + 1):
+        try:
+            async with get_llm_semaphore(tier):
+                if idle:
+                    return await call()
+                return await asyncio.wait_for(call(), timeout)
+        except asyncio.TimeoutError:
+            if attempt == LLM_CALL_ATTEMPTS:
+                raise TimeoutError(
+                    f"{label} ({tier} tier) timed out after {limit}, {LLM_CALL_ATTEMPTS} attempts"
+                ) from None
+            log_warning(f"{label} timed out after {limit}, retrying ({attempt}/{LLM_CALL_ATTEMPTS - 1})", indent=1)
+            await asyncio.sleep(2 ** (attempt - 1))
+
+
+# Local confidence heuristic (see _heuristic_reflection)
+_CITATION_RE = re.compile(r"\[(\d+)\]")
+_HEADER_RE = re.compile(r"^(?:#{1,6}\s|\*\*[^*\n]+\*\*\s*:?\s*$)", re.MULTILINE)
+_LIST_ITEM_RE = re.compile(r"^\s*(?:[-*\u2022]|\d+\.)\s+", re.MULTILINE)
+_GAP_RE = re.compile(
+    r"not (?:disclosed|found|available|mentioned|specified|provided)"
+    r"|no (?:information|data|details)|unclear|unknown",
+    re.IGNORECASE
+)
+CONFIDENT_MIN_CHARS = 1500
+CONFIDENT_MIN_CITATIONS = 10
+CONFIDENT_MIN_SOURCES = 3
+CONFIDENT_MIN_SECTIONS = 2
+CONFIDENT_MIN_NEWS_ITEMS = 8
+CONFIDENT_NEWS_DATED_SHARE = 0.8
+
+
+def _heuristic_reflection(task: SubAgentTask, reflection_inputs: Dict[str, Any]) -> Optional[Reflection]:
+    """Infer a high-confidence reflection locally when the findings are clearly solid.
+
+    The heuristic is deliberately conservative. Findings count as complete
+    only if they are substantial (CONFIDENT_MIN_CHARS), cite at least
+    CONFIDENT_MIN_CITATIONS times across CONFIDENT_MIN_SOURCES distinct
+    sources, are organised under CONFIDENT_MIN_SECTIONS headers, and contain
+    no gap phrases ("not disclosed", "unknown", ...). For news questions the
+    coverage the reflection checklist asks about is checked directly: at
+    least CONFIDENT_MIN_NEWS_ITEMS list items, dates (any format in
+    ``mcp_search.DATE_RE``) for CONFIDENT_NEWS_DATED_SHARE of them, and at
+    least one citation per item. Anything else goes to the reflection call.
+
+    Args:
+        task: The research task assignment
+        reflection_inputs: Inputs from ``_reflection_inputs``
+
+    Returns:
+        Synthetic high-confidence reflection, or None if the LLM should reflect
+    """
+    if not SKIP_CONFIDENT_REFLECTION:
+        return None
+
+    findings = reflection_inputs["findings"]
+    if len(findings) < CONFIDENT_MIN_CHARS or _GAP_RE.search(findings):
+        return None
+
+    citations = _CITATION_RE.findall(findings)
+    if len(citations) < CONFIDENT_MIN_CITATIONS or len(set(citations)) < CONFIDENT_MIN_SOURCES:
+        return None
+    if len(_HEADER_RE.findall(findings)) < CONFIDENT_MIN_SECTIONS:
+        return None
+
+    if _NEWS_QUESTION_RE.search(reflection_inputs["question"]):
+        items = len(_LIST_ITEM_RE.findall(findings))
+        if (
+            items < CONFIDENT_MIN_NEWS_ITEMS
+            or len(extract_dates(findings)) < CONFIDENT_NEWS_DATED_SHARE * items
+            or len(citations) < items
+        ):
+            return None
+
+    log_verbose(
+        f"      Skipping reflection for {task.task_id}: {len(citations)} citations "
+        f"across {len(set(citations))} sources, no gaps flagged"
+    )
+    return Reflection(is_complete=True, missing_aspects=[], confidence="high", next_steps=None)
+
+
+async def _reflect_async(task: SubAgentTask, reflection_inputs: Dict[str, Any]) -> Reflection:
+    """Run the reflection call for a task's findings (with timeout/retry).
+
+    Reflections are cached like findings: a rerun over the same findings
+    and context sample reuses the stored critique. Findings that pass
+    ``_heuristic_reflection`` skip the call entirely.
+
+    Args:
+        task: The research task assignment
+        reflection_inputs: Inputs from ``_reflection_inputs``
+
+    Returns:
+        Self-critique of the findings
+    """
+    reflection = _heuristic_reflection(task, reflection_inputs)
+    if reflection is not None:
+        return reflection
+
+    key = _response_cache_key(REFLECTION_PROMPT, reflection_inputs, REFLECTION_TIER)
+    reflection = _load_reflection(task, key)
+    if reflection is None:
+        chain = get_chain(REFLECTION_PROMPT, Reflection, tier=REFLECTION_TIER)
+        reflection = await _call_with_timeout(
+            lambda: chain.ainvoke(reflection_inputs),
+            REFLECTION_TIMEOUT,
+            f"Reflection for {task.task_id}",
+            tier=REFLECTION_TIER
+        )
+        if key:
+            save_cached("reflections", key, reflection.model_dump_json())
+    return reflection
+
+
+async def _reflect_individually(
+    researched: List[Tuple[SubAgentTask, str, Dict[str, Any], str, List[PageContent]]]
+) -> List[Union[Reflection, Exception]]:
+    """Reflect on each task's findings with its own call.
+
+    Args:
+        researched: (task, findings, reflection inputs, reflection preview,
+            source pages) per task
+
+    Returns:
+        Reflection (or the error raised) for each task, in input order
+    """
+    return list(await asyncio.gather(*(
+        _reflect_async(task, reflection_inputs)
+        for task, _, reflection_inputs, *_ in researched
+    ), return_exceptions=True))
+
+
+async def _reflect_batch_async(
+    researched: List[Tuple[SubAgentTask, str, Dict[str, Any], str, List[PageContent]]]
+) -> List[Union[Reflection, Exception]]:
+    """Reflect on several tasks' findings in one structured call.
+
+    Assessments from earlier batched calls are reused from the
+    "reflections" cache and only the rest go into the batch. Batch results
+    are keyed on the batch prompt, so they never stand in for a single
+    reflection call (nor the reverse). Falls back to one
+    reflection call per task if the batched call fails or the model does
+    not return exactly one assessment per item.
+
+    Args:
+        researched: (task, findings, reflection inputs, reflection preview,
+            source pages) per task, as returned by ``research_sub_agent_async``
+
+    Returns:
+        Reflection (or the error raised) for each task, in input order
+    """
+    keys = [
+        _response_cache_key(REFLECTION_BATCH_PROMPT, reflection_inputs, REFLECTION_TIER)
+        for _, _, reflection_inputs, *_ in researched
+    ]
+    reflections: List[Union[Reflection, Exception, None]] = [
+        _load_reflection(task, key) for (task, *_), key in zip(researched, keys)
+    ]
+    pending = [index for index, reflection in enumerate(reflections) if reflection is None]
+    if not pending:
+        return reflections
+
+    todo = [researched[index] for index in pending]
+    items = "\n".join(
+        REFLECTION_BATCH_ITEM.format(index=index, **reflection_inputs)
+        for index, (_, _, reflection_inputs, *_) in enumerate(todo, start=1)
+    )
+    chain = get_chain(REFLECTION_BATCH_PROMPT, ReflectionBatch, tier=REFLECTION_TIER)
+    try:
+        batch = await _call_with_timeout(
+            lambda: chain.ainvoke({"count": len(todo), "items": items}),
+            REFLECTION_TIMEOUT * len(todo),
+            f"Batched reflection for {len(todo)} sub-agents",
+            tier=REFLECTION_TIER
+        )
+    except Exception as e:
+        log_warning(f"Batched reflection failed ({e}), reflecting individually", indent=1)
+        fresh = await _reflect_individually(todo)
+    else:
+        if len(batch.items) == len(todo):
+            fresh = batch.items
+            for index, reflection in zip(pending, fresh):
+                if keys[index]:
+                    save_cached("reflections", keys[index], reflection.model_dump_json())
+        else:
+            log_warning(f"Batched reflection returned {len(batch.items)} of {len(todo)} items, reflecting individually", indent=1)
+            fresh = await _reflect_individually(todo)
+
+    for index, reflection in zip(pending, fresh):
+        reflections[index] = reflection
+    return reflections
+
+
+def _log_findings(task: SubAgentTask, prompt_preview: str, findings: str) -> None:
+    """Log the research LLM call and its findings.
+
+    Args:
+        task: The research task assignment
+        prompt_preview: Prompt preview from ``_research_inputs``
+        findings: Research findings text
+    """
     mode_label = "Refinement" if task.is_refinement else "Research"
     log_llm_call(
         purpose=f"Sub-Agent {mode_label}: {task.task_id}",
-        prompt_preview=research_prompt_text,
+        prompt_preview=prompt_preview,
         response_preview=findings,
         truncate=400
     )
 
     log_verbose(f"      Findings size: {format_size(len(findings))}")
 
-    # Step 2: Reflection - Self-critique
-    # V2.9: Enhanced with question-specific checklists
+
+def _reflection_inputs(
+    task: SubAgentTask,
+    findings: str,
+    context_sample: str,
+    original_question: str = None
+) -> Tuple[Dict[str, Any], str]:
+    """Build the reflection prompt inputs for a task's findings.
+
+    V2.9: Enhanced with question-specific checklists
+
+    Args:
+        task: The research task assignment
+        findings: Research findings to critique
+        context_sample: Leading sample of the context the findings were
+            drawn from (from ``_research_inputs``)
+        original_question: Original question text (for refinement tasks)
+
+    Returns:
+        Tuple of (prompt inputs, prompt preview for logging); the preview
+        is only rendered in verbose mode (empty otherwise)
+    """
     print(f"  → Sub-agent reflecting on: {task.task_id}")
-    context_sample = context[:2000]  # Sample for reflection
 
+    # Refinement tasks carry their parent's task_id as question, so the
+    # critique (and _heuristic_reflection) must see the original question
+    question = original_question if task.is_refinement and original_question else task.question
     # Get question-specific checklist for targeted reflection
-    question_for_checklist = original_question if task.is_refinement and original_question else task.question
-    checklist = get_reflection_checklist(question_for_checklist)
-
-    reflection_prompt_text = REFLECTION_PROMPT.format(
-        question=task.question,
-        findings=findings[:500] + "...",
-        context_sample=context_sample[:300] + "...",
-        question_specific_checklist=checklist[:200] + "..."
-    )
+    checklist = get_reflection_checklist(question)
+
+    reflection_prompt_text = ""
+    if is_verbose():
+        reflection_prompt_text = REFLECTION_PROMPT.format(
+            question=question,
+            findings=findings[:500] + "...",
+            context_sample=context_sample[:300] + "...",
+            question_specific_checklist=checklist[:200] + "..."
+        )
 
-    reflection = (REFLECTION_PROMPT | reflection_llm).invoke({
-        "question": task.question,
+    inputs = {
+        "question": question,
         "findings": findings,
         "context_sample": context_sample,
         "question_specific_checklist": checklist,
-    })
+    }
+    return inputs, reflection_prompt_text
+
+
+def _build_result(
+    task: SubAgentTask,
+    pages: Collection[PageContent],
+    findings: str,
+    reflection: Reflection,
+    reflection_prompt_text: str
+) -> SubAgentResult:
+    """Log the reflection and assemble the sub-agent result.
 
+    Args:
+        task: The research task assignment
+        pages: Pages the findings were drawn from (the task's context)
+        findings: Research findings text
+        reflection: Self-critique of the findings
+        reflection_prompt_text: Prompt preview from ``_reflection_inputs``
+
+    Returns:
+        SubAgentResult with findings and reflection
+    """
     log_llm_call(
         purpose=f"Sub-Agent Reflection: {task.task_id}",
         prompt_preview=reflection_prompt_text,
         response_preview=f"Complete: {reflection.is_complete}, Confidence: {reflection.confidence}",
+        model=MODEL_TIERS[REFLECTION_TIER],
         truncate=400
     )
 
-    # Log reflection details
-    log_verbose(f"      Reflection assessment:")
-    log_verbose(f"         Is Complete: {reflection.is_complete}")
-    log_verbose(f"         Confidence: {reflection.confidence}")
-    if reflection.missing_aspects:
-        log_verbose(f"         Missing Aspects: {', '.join(reflection.missing_aspects[:3])}")
-    if reflection.next_steps:
-        log_verbose(f"         Next Steps: {reflection.next_steps[:100]}...")
-
-    # Collect sources from pages
+    # Log reflection details (one write, so parallel sub-agents don't interleave)
+    if is_verbose():
+        lines = [
+            f"      Reflection assessment:",
+            f"         Is Complete: {reflection.is_complete}",
+            f"         Confidence: {reflection.confidence}",
+        ]
+        if reflection.missing_aspects:
+            lines.append(f"         Missing Aspects: {', '.join(reflection.missing_aspects[:3])}")
+        if reflection.next_steps:
+            lines.append(f"         Next Steps: {reflection.next_steps[:100]}...")
+        log_lines([f"{Colors.DIM}{line}{Colors.RESET}" for line in lines])
+
+    # Sources are the pages the sub-agent's context was built from
     sources = [p.url for p in pages]
 
     result = SubAgentResult(
@@ -563,3 +1004,318 @@ These are the MOST LIKELY locations of the missing information.
     print(f"  ✓ Sub-agent completed: {task.task_id} (confidence: {reflection.confidence})")
 
     return result
+
+
+async def research_sub_agent_async(
+    task: SubAgentTask,
+    pages: Collection[PageContent],
+    company_name: str,
+    original_question: str = None,
+    shared_context: Optional[str] = None
+) -> Tuple[str, Dict[str, Any], str, List[PageContent]]:
+    """Run the research step of a sub-agent, leaving reflection to the caller.
+
+    ``execute_sub_agents`` uses this to release a research slot before the
+    task's reflection runs.
+
+    Args:
+        task: The research task assignment
+        pages: Pages ``shared_context`` was built from, or all available
+            pages to select the task's own context from
+        company_name: Name of the company being researched
+        original_question: Original question text (for refinement tasks)
+        shared_context: Prebuilt context shared by a batch of tasks (see
+            ``build_context``); built per task when omitted
+
+    Returns:
+        Tuple of (findings, reflection prompt inputs, reflection preview,
+        pages the findings were drawn from)
+    """
+    prompt, inputs, prompt_preview, context_sample, context_pages = _research_inputs(
+        task, pages, company_name, original_question, shared_context
+    )
+    key = _response_cache_key(prompt, inputs)
+    findings = _load_findings(task, key)
+    if findings is None:
+        findings = await _call_with_timeout(
+            lambda: _acollect_stream(get_chain(prompt).astream(inputs), task, RESEARCH_IDLE_TIMEOUT),
+            RESEARCH_IDLE_TIMEOUT,
+            f"Research for {task.task_id}",
+            idle=True
+        )
+        if key:
+            save_cached("findings", key, json.dumps(findings))
+    _log_findings(task, prompt_preview, findings)
+
+    reflection_inputs, reflection_preview = _reflection_inputs(
+        task, findings, context_sample, original_question
+    )
+    return findings, reflection_inputs, reflection_preview, context_pages
+
+
+async def research_batch_async(
+    tasks: List[SubAgentTask],
+    company_name: str,
+    context: str
+) -> Dict[str, Tuple[str, Dict[str, Any], str]]:
+    """Research several tasks that share one context in a single call.
+
+    Args:
+        tasks: Research task assignments (not refinements)
+        company_name: Name of the company being researched
+        context: Context shared by every task
+
+    Returns:
+        (findings, reflection prompt inputs, reflection preview) per task_id,
+        as the first three values from ``research_sub_agent_async``; tasks
+        the model did not answer are left out
+    """
+    questions = "\n\n".join(f"[{task.task_id}] {task.question}" for task in tasks)
+    inputs = {
+        "company_name": company_name,
+        "context": context,
+        "count": len(tasks),
+        "questions": questions,
+    }
+    print(f"  → Sub-agents researching {len(tasks)} questions in one batch")
+    log_verbose(f"      Context size: {format_size(len(context))}")
+
+    key = _response_cache_key(BATCHED_SUB_AGENT_PROMPT, inputs)
+    cached = load_cached("findings", key) if key else None
+    if cached is not None:
+        batch = BatchedFindings.model_validate_json(cached)
+        log_verbose("      Batched findings loaded from cache")
+    else:
+        chain = get_chain(BATCHED_SUB_AGENT_PROMPT, BatchedFindings)
+        batch = await _call_with_timeout(
+            lambda: chain.ainvoke(inputs),
+            RESEARCH_TIMEOUT * len(tasks),
+            f"Batched research for {len(tasks)} sub-agents"
+        )
+        if key:
+            save_cached("findings", key, batch.model_dump_json())
+
+    prompt_preview = ""
+    if is_verbose():
+        prompt_preview = BATCHED_SUB_AGENT_PROMPT.format(
+            company_name=company_name,
+            context=context[:500] + "...",
+            count=len(tasks),
+            questions=questions
+        )
+
+    answers = {answer.task_id: answer for answer in batch.answers}
+    researched = {}
+    for task in tasks:
+        answer = answers.get(task.task_id)
+        if answer is None or not answer.findings.strip():
+            continue
+        _log_findings(task, prompt_preview, answer.findings)
+        if answer.missing:
+            log_verbose(f"      {task.task_id} missing: {', '.join(answer.missing[:3])}")
+        reflection_inputs, reflection_preview = _reflection_inputs(
+            task, answer.findings, context[:CONTEXT_SAMPLE_CHARS]
+        )
+        researched[task.task_id] = (answer.findings, reflection_inputs, reflection_preview)
+    return researched
+
+
+def _question_batches(
+    tasks: List[SubAgentTask],
+    contexts: Dict[str, str]
+) -> List[Tuple[List[SubAgentTask], str]]:
+    """Group tasks with an identical prebuilt context for batched research.
+
+    Args:
+        tasks: Research task assignments
+        contexts: Prebuilt context per task_id
+
+    Returns:
+        (tasks, shared context) per batch of two or more tasks, at most
+        ``BATCHED_QUESTIONS_MAX`` each; refinement tasks, tasks without a
+        prebuilt context and contexts over ``BATCHED_CONTEXT_MAX_CHARS``
+        are left out
+    """
+    by_context: Dict[str, List[SubAgentTask]] = {}
+    for task in tasks:
+        context = contexts.get(task.task_id)
+        if task.is_refinement or context is None or len(context) > BATCHED_CONTEXT_MAX_CHARS:
+            continue
+        by_context.setdefault(context, []).append(task)
+
+    batches = []
+    for context, group in by_context.items():
+        for start in range(0, len(group), BATCHED_QUESTIONS_MAX):
+            chunk = group[start:start + BATCHED_QUESTIONS_MAX]
+            if len(chunk) > 1:
+                batches.append((chunk, context))
+    return batches
+
+
+async def execute_sub_agents(
+    tasks: List[SubAgentTask],
+    pages: Collection[PageContent],
+    company_name: str,
+    contexts: Optional[Dict[str, str]] = None,
+    context_pages: Optional[Dict[str, List[PageContent]]] = None,
+    max_concurrency: int = SUB_AGENT_MAX_CONCURRENCY,
+    batch_reflections: bool = BATCH_REFLECTIONS,
+    batch_questions: bool = BATCH_SUB_AGENT_QUESTIONS
+) -> Dict[str, Union[SubAgentResult, Exception]]:
+    """Execute many sub-agent tasks concurrently on the event loop.
+
+    Every task runs in one ``asyncio.TaskGroup`` as a two-stage pipeline:
+    at most ``max_concurrency`` research calls are in flight, and a task
+    gives up its slot as soon as its findings are in, so its reflection
+    overlaps the research of the tasks after it. A failing task is reported
+    in its slot and does not cancel the others.
+
+    With ``batch_reflections``, reflection waits until all research is done
+    and findings are critiqued ``REFLECTION_BATCH_SIZE`` at a time, one
+    structured call per group.
+
+    With ``batch_questions``, tasks sharing one prebuilt context are
+    researched together (see ``research_batch_async``), one research slot
+    per batch; a task the batch does not answer, or a failed batch, falls
+    back to its own research call.
+
+    Args:
+        tasks: Research task assignments
+        pages: All available page content
+        company_name: Name of the company being researched
+        contexts: Prebuilt context per task_id (built by the caller, once,
+            before the fan-out); tasks without one build their own
+        context_pages: Pages each prebuilt context was built from, per
+            task_id (reported as the result's sources); all pages when
+            omitted
+        max_concurrency: Maximum research calls in flight
+        batch_reflections: Reflect in groups instead of per task
+        batch_questions: Research tasks sharing a context in one call
+
+    Returns:
+        Dictionary mapping task_id to its SubAgentResult, or to the
+        exception that stopped it (in task order)
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    contexts = contexts or {}
+    context_pages = context_pages or {}
+    outcomes: Dict[str, Union[SubAgentResult, Exception]] = {}
+    researched = []  # Findings awaiting batched reflection
+
+    async def run(task: SubAgentTask) -> None:
+        try:
+            async with semaphore:
+                researched_task = await research_sub_agent_async(
+                    task, context_pages.get(task.task_id, pages), company_name,
+                    shared_context=contexts.get(task.task_id)
+                )
+            await reflect(task, *researched_task)
+        except Exception as e:
+            outcomes[task.task_id] = e
+
+    async def reflect(
+        task: SubAgentTask,
+        findings: str,
+        reflection_inputs: Dict[str, Any],
+        reflection_preview: str,
+        source_pages: List[PageContent]
+    ) -> None:
+        try:
+            if batch_reflections:
+                reflection = _heuristic_reflection(task, reflection_inputs)
+                if reflection is None:
+                    researched.append((task, findings, reflection_inputs, reflection_preview, source_pages))
+                    return
+            else:
+                reflection = await _reflect_async(task, reflection_inputs)
+            outcomes[task.task_id] = _build_result(
+                task, source_pages, findings, reflection, reflection_preview
+            )
+        except Exception as e:
+            outcomes[task.task_id] = e
+
+    async def run_batch(batch_tasks: List[SubAgentTask], context: str) -> None:
+        try:
+            async with semaphore:
+                researched_batch = await research_batch_async(batch_tasks, company_name, context)
+        except Exception as e:
+            log_warning(f"Batched research failed ({e}), researching {len(batch_tasks)} questions individually", indent=1)
+            researched_batch = {}
+        # Batched tasks share one context, so one page set
+        source_pages = list(context_pages.get(batch_tasks[0].task_id, pages))
+        async with asyncio.TaskGroup() as batch_group:
+            for task in batch_tasks:
+                if task.task_id in researched_batch:
+                    batch_group.create_task(reflect(task, *researched_batch[task.task_id], source_pages))
+                else:
+                    batch_group.create_task(run(task))
+
+    async def reflect_group(group_items: List[Tuple[SubAgentTask, str, Dict[str, Any], str, List[PageContent]]]) -> None:
+        try:
+            reflections = await _reflect_batch_async(group_items)
+        except Exception as e:
+            log_warning(f"Batched reflection failed ({e}), reflecting individually", indent=1)
+            reflections = await _reflect_individually(group_items)
+        for (task, findings, _, reflection_preview, source_pages), reflection in zip(group_items, reflections):
+            if isinstance(reflection, Exception):
+                outcomes[task.task_id] = reflection
+                continue
+            try:
+                outcomes[task.task_id] = _build_result(
+                    task, source_pages, findings, reflection, reflection_preview
+                )
+            except Exception as e:
+                outcomes[task.task_id] = e
+
+    batches = _question_batches(tasks, contexts) if batch_questions else []
+    batched_ids = {task.task_id for batch_tasks, _ in batches for task in batch_tasks}
+
+    async with asyncio.TaskGroup() as group:
+        for batch_tasks, context in batches:
+            group.create_task(run_batch(batch_tasks, context))
+        for task in tasks:
+            if task.task_id not in batched_ids:
+                group.create_task(run(task))
+
+    if researched:
+        async with asyncio.TaskGroup() as group:
+            for start in range(0, len(researched), REFLECTION_BATCH_SIZE):
+                group.create_task(reflect_group(researched[start:start + REFLECTION_BATCH_SIZE]))
+
+    return {task.task_id: outcomes[task.task_id] for task in tasks}
+
+
+async def execute_sub_agent_async(
+    task: SubAgentTask,
+    pages: Collection[PageContent],
+    company_name: str,
+    original_question: str = None,
+    shared_context: Optional[str] = None
+) -> SubAgentResult:
+    """Execute a sub-agent research task with reflection.
+
+    Both LLM calls are awaited, so many sub-agents can run concurrently on
+    one event loop instead of each holding a worker thread.
+
+    Args:
+        task: The research task assignment
+        pages: Pages ``shared_context`` was built from, or all available
+            pages to select the task's own context from; any re-iterable
+            collection such as ``state.pages.values()`` works
+        company_name: Name of the company being researched
+        original_question: Original question text (for refinement tasks)
+        shared_context: Prebuilt context shared by a batch of tasks (see
+            ``build_context``); built per task when omitted
+
+    Returns:
+        SubAgentResult with findings and reflection
+    """
+    # Step 1: Research - Sub-agent analyzes content
+    findings, reflection_inputs, reflection_preview, context_pages = await research_sub_agent_async(
+        task, pages, company_name, original_question, shared_context
+    )
+
+    # Step 2: Reflection - Self-critique
+    reflection = await _reflect_async(task, reflection_inputs)
+
+    return _build_result(task, context_pages, findings, reflection, reflection_preview)
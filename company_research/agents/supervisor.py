@@ -1,18 +1,21 @@
 """Research supervisor that coordinates sub-agents."""
 
+import asyncio
 from typing import Dict, Any
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from langchain_core.prompts import ChatPromptTemplate
-from ..config import get_llm
+from langchain_core.messages import SystemMessage
+from ..config import (
+    get_chain, LLM_TEMPERATURE, MODEL_TIERS, SUB_AGENT_MAX_CONCURRENCY, SHARED_SUB_AGENT_CONTEXT
+)
 from ..schema import (
     ResearchState, Note, SubAgentTask, SubAgentResult, SupervisorReview
 )
 from ..scraping import CompanyScraper
-from ..storage import save_page
-from .sub_agent import execute_sub_agent
+from ..storage import save_page, cache_key, load_cached, save_cached
+from .sub_agent import execute_sub_agents, build_context, select_relevant_pages
 from ..logger import (
     log_phase, log_step, log_llm_call, log_verbose, log_success,
-    log_warning, log_error, log_metric, Colors, Timer, format_size
+    log_warning, log_error, log_metric, is_verbose, Colors, Timer, format_size
 )
 
 
@@ -68,18 +71,18 @@ Provide your assessment.
 """
 
 SUPERVISOR_REVIEW_PROMPT = ChatPromptTemplate.from_messages([
-    ("system", SUPERVISOR_REVIEW_SYSTEM),
+    SystemMessage(content=SUPERVISOR_REVIEW_SYSTEM),
     ("user", SUPERVISOR_REVIEW_HUMAN),
 ])
 
 
-def supervisor_node(state: ResearchState) -> Dict[str, Any]:
+async def supervisor_node(state: ResearchState) -> Dict[str, Any]:
     """Execute the research supervision phase with parallel sub-agents.
 
     This node:
-    1. Fetches all seed URLs
+    1. Fetches all seed URLs (concurrently)
     2. Creates sub-agent tasks for each research question
-    3. Executes sub-agents in parallel
+    3. Executes sub-agents concurrently on the event loop
     4. Reviews all findings
     5. Compiles results into notes
 
@@ -99,28 +102,29 @@ def supervisor_node(state: ResearchState) -> Dict[str, Any]:
     fetch_count = 0
 
     with Timer("URL Fetching") as fetch_timer:
-        for url in state.brief.seed_urls:
-            url_str = str(url)
-            if url_str not in state.pages:
-                try:
-                    print(f"   {Colors.LINK} Fetching: {Colors.DIM}{url_str}{Colors.RESET}")
-                    page = scraper.fetch(url_str)
-                    state.pages[url_str] = page
-                    save_page(page)
-
-                    # Track metrics
-                    page_size = len(page.text)
-                    total_size += page_size
-                    fetch_count += 1
-
-                    log_verbose(f"      HTTP Status: 200")
-                    log_verbose(f"      Raw HTML: {format_size(len(page.raw_html))}")
-                    log_verbose(f"      Markdown: {format_size(page_size)}")
-                    log_verbose(f"      Title: {page.title[:60]}")
-
-                except Exception as e:
-                    log_warning(f"Failed to fetch {url_str}: {str(e)}", indent=1)
-                    continue
+        # Seeds are fetched concurrently by the scraper's bounded thread
+        # pool, off the event loop. Results are applied in seed order.
+        to_fetch = [str(url) for url in state.brief.seed_urls if str(url) not in state.pages]
+        for url_str in to_fetch:
+            print(f"   {Colors.LINK} Fetching: {Colors.DIM}{url_str}{Colors.RESET}")
+        fetched = await asyncio.to_thread(scraper.fetch_many, to_fetch)
+
+        for url_str, page in fetched.items():
+            if isinstance(page, Exception):
+                log_warning(f"Failed to fetch {url_str}: {str(page)}", indent=1)
+                continue
+            state.pages[url_str] = page
+            save_page(page)
+
+            # Track metrics
+            page_size = len(page.text)
+            total_size += page_size
+            fetch_count += 1
+
+            log_verbose(f"      HTTP Status: 200 ({url_str})")
+            log_verbose(f"      Raw HTML: {format_size(len(page.raw_html))}")
+            log_verbose(f"      Markdown: {format_size(page_size)}")
+            log_verbose(f"      Title: {page.title[:60]}")
 
     pages_list = list(state.pages.values())
     log_success(f"Fetched {fetch_count}/{len(state.brief.seed_urls)} pages (total: {format_size(total_size)})", indent=1)
@@ -130,57 +134,57 @@ def supervisor_node(state: ResearchState) -> Dict[str, Any]:
     # Step 2: Create sub-agent tasks
     log_step(f"\n{Colors.TARGET} [2/4] Creating sub-agent tasks...", emoji="")
     tasks = []
-    for idx, question in enumerate(state.brief.sub_questions):
+    contexts = {}  # Built once here, before the fan-out; same rankings share one build
+    context_pages = {}  # Pages behind each context (the result's sources)
+    shared_context = build_context(pages_list) if SHARED_SUB_AGENT_CONTEXT else None
+    if shared_context is not None:
+        log_verbose(f"   Shared context for all sub-agents: {len(pages_list)} pages, {format_size(len(shared_context))}")
+    for idx, (task_id, question) in enumerate(state.brief.question_by_task_id.items()):
         task = SubAgentTask(
-            task_id=f"q_{idx}",
+            task_id=task_id,
             question=question,
             context_urls=[p.url for p in pages_list]
         )
         tasks.append(task)
+        if shared_context is not None:
+            # Same context for every task: one cacheable prompt prefix
+            selected_pages = pages_list
+            contexts[task_id] = shared_context
+        else:
+            # Each sub-agent only reads the pages most relevant to its question
+            selected_pages = select_relevant_pages(pages_list, question)
+            contexts[task_id] = build_context(selected_pages, question=question)
+        context_pages[task_id] = selected_pages
 
         # Show shortened question
         short_q = question[:65] + "..." if len(question) > 65 else question
         print(f"   {Colors.DIM}Task {idx + 1}: {task.task_id} - {short_q}{Colors.RESET}")
         log_verbose(f"      Full question: {question}")
-        log_verbose(f"      Context: {len(pages_list)} pages, {format_size(total_size)}")
+        log_verbose(f"      Context: {len(selected_pages)}/{len(pages_list)} pages, {format_size(len(contexts[task_id]))}")
 
     # Step 3: Execute sub-agents in parallel
     # V2.9: Increased from 3 to 5 workers for faster execution
-    log_step(f"\n{Colors.ROBOT} [3/4] Executing {len(tasks)} sub-agents in parallel (5 workers)...", emoji="")
-    log_verbose(f"   ThreadPoolExecutor configured with max_workers=5")
+    log_step(f"\n{Colors.ROBOT} [3/4] Executing {len(tasks)} sub-agents in parallel ({SUB_AGENT_MAX_CONCURRENCY} at once)...", emoji="")
+    log_verbose(f"   Sub-agents run as asyncio tasks (max {SUB_AGENT_MAX_CONCURRENCY} researching at once, reflections pipelined)")
     results = {}
 
     with Timer("Parallel Sub-Agent Execution") as parallel_timer:
-        with ThreadPoolExecutor(max_workers=5) as executor:
-            # Submit all sub-agent tasks
-            future_to_task = {
-                executor.submit(execute_sub_agent, task, pages_list, state.brief.company_name): task
-                for task in tasks
-            }
-
-            log_verbose(f"   Submitted {len(future_to_task)} tasks to executor")
-
-            # Collect results as they complete
-            completed_count = 0
-            for future in as_completed(future_to_task):
-                task = future_to_task[future]
-                try:
-                    result = future.result()
-                    results[result.task_id] = result
-                    completed_count += 1
-
-                    # Show progress
-                    log_verbose(f"   ✓ {completed_count}/{len(tasks)} complete: {task.task_id}")
-
-                except Exception as e:
-                    log_error(f"Sub-agent {task.task_id} failed: {str(e)}", indent=1)
+        outcomes = await execute_sub_agents(
+            tasks, pages_list, state.brief.company_name,
+            contexts=contexts, context_pages=context_pages,
+            max_concurrency=SUB_AGENT_MAX_CONCURRENCY
+        )
+        for task_id, outcome in outcomes.items():
+            if isinstance(outcome, Exception):
+                log_error(f"Sub-agent {task_id} failed: {str(outcome)}", indent=1)
+            else:
+                results[task_id] = outcome
 
     log_success(f"Completed {len(results)}/{len(tasks)} sub-agents in {parallel_timer.elapsed():.1f}s", indent=1)
     log_verbose(f"   Average time per sub-agent: {parallel_timer.elapsed() / len(results):.1f}s" if results else "   No results")
 
     # Step 4: Supervisor review
     log_step(f"\n{Colors.CHART} [4/4] Supervisor reviewing findings...", emoji="")
-    review_llm = get_llm().with_structured_output(SupervisorReview)
 
     # Prepare findings summary
     log_verbose(f"   Compiling findings from {len(results)} sub-agents...")
@@ -201,22 +205,41 @@ def supervisor_node(state: ResearchState) -> Dict[str, Any]:
     log_verbose(f"   Total findings: {format_size(total_findings_size)}")
 
     # Invoke supervisor review
-    review_prompt_text = SUPERVISOR_REVIEW_PROMPT.format(
-        company_name=state.brief.company_name,
-        research_brief=state.brief.main_question,
-        refinement_iteration=state.refinement_iteration,
-        findings_summary=findings_summary[:500] + "...",
-        reflections=reflections[:500] + "..."
-    )
+    review_prompt_text = ""
+    if is_verbose():
+        review_prompt_text = SUPERVISOR_REVIEW_PROMPT.format(
+            company_name=state.brief.company_name,
+            research_brief=state.brief.main_question,
+            refinement_iteration=state.refinement_iteration,
+            findings_summary=findings_summary[:500] + "...",
+            reflections=reflections[:500] + "..."
+        )
+
+    review_inputs = {
+        "company_name": state.brief.company_name,
+        "research_brief": state.brief.main_question,
+        "refinement_iteration": state.refinement_iteration,
+        "findings_summary": findings_summary,
+        "reflections": reflections,
+    }
+    # Cached like sub-agent findings: only deterministic responses, keyed by
+    # model, prompt template and every input (so new findings miss)
+    review_key = None
+    if LLM_TEMPERATURE == 0:
+        review_key = cache_key(
+            MODEL_TIERS["default"], repr(SUPERVISOR_REVIEW_PROMPT.messages),
+            *(f"{k}={review_inputs[k]}" for k in sorted(review_inputs))
+        )
+    cached = load_cached("reviews", review_key) if review_key else None
 
     with Timer("Supervisor Review"):
-        supervisor_review = (SUPERVISOR_REVIEW_PROMPT | review_llm).invoke({
-            "company_name": state.brief.company_name,
-            "research_brief": state.brief.main_question,
-            "refinement_iteration": state.refinement_iteration,
-            "findings_summary": findings_summary,
-            "reflections": reflections,
-        })
+        if cached is not None:
+            supervisor_review = SupervisorReview.model_validate_json(cached)
+            log_verbose("   Supervisor review loaded from cache")
+        else:
+            supervisor_review = await get_chain(SUPERVISOR_REVIEW_PROMPT, SupervisorReview).ainvoke(review_inputs)
+            if review_key:
+                save_cached("reviews", review_key, supervisor_review.model_dump_json())
 
     log_llm_call(
         purpose="Supervisor Review & Gap Analysis",
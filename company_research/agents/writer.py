@@ -3,12 +3,13 @@
 from typing import Dict, Any
 from datetime import datetime
 from langchain_core.prompts import ChatPromptTemplate
-from ..config import get_llm
-from ..schema import ResearchState, StructuredReport
+from langchain_core.messages import SystemMessage
+from ..config import get_chain
+from ..schema import ResearchState, StructuredReport, findings_segments
 from ..storage import save_report, save_report_json
 from ..logger import (
     log_phase, log_step, log_llm_call, log_verbose, log_success,
-    log_metric, Colors, Timer, format_size
+    log_metric, is_verbose, Colors, Timer, format_size
 )
 
 
@@ -104,7 +105,7 @@ CRITICAL INSTRUCTIONS:
 """
 
 WRITER_PROMPT = ChatPromptTemplate.from_messages([
-    ("system", FINAL_REPORT_SYSTEM),
+    SystemMessage(content=FINAL_REPORT_SYSTEM),
     ("user", FINAL_REPORT_HUMAN),
 ])
 
@@ -145,12 +146,12 @@ Return structured JSON matching the StructuredReport schema.
 """
 
 JSON_EXTRACTOR_PROMPT = ChatPromptTemplate.from_messages([
-    ("system", JSON_EXTRACTOR_SYSTEM),
+    SystemMessage(content=JSON_EXTRACTOR_SYSTEM),
     ("user", JSON_EXTRACTOR_HUMAN),
 ])
 
 
-def writer_node(state: ResearchState) -> Dict[str, Any]:
+async def writer_node(state: ResearchState) -> Dict[str, Any]:
     """Execute the writing phase.
 
     This node:
@@ -167,20 +168,22 @@ def writer_node(state: ResearchState) -> Dict[str, Any]:
     """
     log_phase(3, "REPORT WRITING")
 
-    llm = get_llm()
-    json_llm = get_llm().with_structured_output(StructuredReport, method="function_calling")
-
     # Step 1: Compile research notes
     log_step(f"{Colors.WRITE} [1/2] Compiling research notes...", emoji="")
     log_verbose(f"   Compiling {len(state.notes)} research notes...")
 
-    notes_text = ""
+    # V2.7: Refinement addenda are joined here, in a single pass
+    notes_parts = []
     total_notes_size = 0
     for k, note in state.notes.items():
-        note_section = f"### {k}\n{note.content}\n\n"
-        notes_text += note_section
-        total_notes_size += len(note.content)
-        log_verbose(f"      {k}: {format_size(len(note.content))}, {len(note.sources)} sources")
+        segments = findings_segments(note.content, note.addenda)
+        note_size = sum(map(len, segments))
+        notes_parts.append(f"### {k}\n")
+        notes_parts.extend(segments)
+        notes_parts.append("\n\n")
+        total_notes_size += note_size
+        log_verbose(f"      {k}: {format_size(note_size)}, {len(note.sources)} sources")
+    notes_text = "".join(notes_parts)
 
     log_success(f"Compiled {len(state.notes)} notes (total: {format_size(total_notes_size)})", indent=1)
     log_verbose(f"   Average note size: {format_size(total_notes_size // len(state.notes))}")
@@ -188,15 +191,17 @@ def writer_node(state: ResearchState) -> Dict[str, Any]:
     # Generate markdown report
     log_step(f"\n{Colors.WRITE} Generating markdown report...", emoji="")
 
-    # Prepare prompt preview for logging
-    writer_prompt_text = WRITER_PROMPT.format(
-        company_name=state.brief.company_name,
-        brief=state.brief.main_question,
-        notes=notes_text[:800] + "..."  # Truncated for preview
-    )
+    # Prepare prompt preview for logging (only shown in verbose mode)
+    writer_prompt_text = ""
+    if is_verbose():
+        writer_prompt_text = WRITER_PROMPT.format(
+            company_name=state.brief.company_name,
+            brief=state.brief.main_question,
+            notes=notes_text[:800] + "..."  # Truncated for preview
+        )
 
     with Timer("Markdown Report Generation"):
-        resp = (WRITER_PROMPT | llm).invoke({
+        resp = await get_chain(WRITER_PROMPT).ainvoke({
             "company_name": state.brief.company_name,
             "brief": state.brief.main_question,
             "notes": notes_text,
@@ -226,14 +231,18 @@ def writer_node(state: ResearchState) -> Dict[str, Any]:
     # Step 2: Generate structured JSON report
     log_step(f"\n{Colors.WRITE} [2/2] Generating structured JSON report...", emoji="")
 
-    # Prepare JSON extractor prompt for logging
-    json_prompt_text = JSON_EXTRACTOR_PROMPT.format(
-        company_name=state.brief.company_name,
-        markdown_report=report_md[:800] + "..."  # Truncated for preview
-    )
+    # Prepare JSON extractor prompt for logging (only shown in verbose mode)
+    json_prompt_text = ""
+    if is_verbose():
+        json_prompt_text = JSON_EXTRACTOR_PROMPT.format(
+            company_name=state.brief.company_name,
+            markdown_report=report_md[:800] + "..."  # Truncated for preview
+        )
 
     with Timer("JSON Report Extraction"):
-        structured_report = (JSON_EXTRACTOR_PROMPT | json_llm).invoke({
+        structured_report = await get_chain(
+            JSON_EXTRACTOR_PROMPT, StructuredReport, method="function_calling"
+        ).ainvoke({
             "company_name": state.brief.company_name,
             "markdown_report": report_md,
         })
@@ -1,16 +1,222 @@
 """LLM configuration and factory."""
 
 import os
+import asyncio
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, Dict, Hashable, Optional
+import httpx
 from langchain_openai import ChatOpenAI
 
 
-def get_llm():
+# Async clients and semaphores are bound to the event loop they are first used
+# on, so async callers cache them per run (see llm_run_scope); the run's
+# cache is dropped and its async clients closed when the run ends.
+# Synchronous callers share one process-wide cache.
+_run_cache: ContextVar[Optional[Dict[Hashable, Any]]] = ContextVar("llm_run_cache", default=None)
+_sync_cache: Dict[Hashable, Any] = {}
+
+# Zero temperature for maximum factual consistency. Responses are only
+# cached on disk while this stays 0 (deterministic outputs).
+LLM_TEMPERATURE = 0
+
+# Upper bound on concurrent refinement sub-agents (each is I/O-bound on LLM
+# calls); the pool is sized min(tasks, this)
+REFINE_MAX_WORKERS = max(1, int(os.getenv("REFINE_MAX_WORKERS", "8")))
+
+# Sub-agents researching at once in the supervisor phase (V2.9: 5). Each
+# is a coroutine waiting on the API, so this only needs to stay within the
+# provider's rate limit (see LLM_MAX_CONCURRENCY)
+SUB_AGENT_MAX_CONCURRENCY = max(1, int(os.getenv("SUB_AGENT_MAX_CONCURRENCY", "5")))
+
+# Opt-in: give every sub-agent the same unranked context over all pages
+# instead of its own ranked selection. The prompts then share a byte-identical
+# prefix the provider can cache, at the cost of longer per-task contexts.
+SHARED_SUB_AGENT_CONTEXT = os.getenv("SHARED_SUB_AGENT_CONTEXT", "0") == "1"
+
+# Opt-in: sub-agents that share one context (see SHARED_SUB_AGENT_CONTEXT)
+# answer up to BATCHED_QUESTIONS_MAX questions in one structured call, so
+# the context is sent once per group; contexts over BATCHED_CONTEXT_MAX_CHARS
+# keep one call per question
+BATCH_SUB_AGENT_QUESTIONS = os.getenv("BATCH_SUB_AGENT_QUESTIONS", "0") == "1"
+BATCHED_QUESTIONS_MAX = max(1, int(os.getenv("BATCHED_QUESTIONS_MAX", "6")))
+BATCHED_CONTEXT_MAX_CHARS = int(os.getenv("BATCHED_CONTEXT_MAX_CHARS", "300000"))
+
+# Opt-in: in question-ranked contexts, cut pages longer than
+# SMART_EXTRACT_MAX_CHARS down to SMART_EXTRACT_WINDOW chars either side of
+# each keyword hit (off by default: the full text is the reviewed behaviour)
+SMART_EXTRACT = os.getenv("SMART_EXTRACT", "0") == "1"
+SMART_EXTRACT_MAX_CHARS = int(os.getenv("SMART_EXTRACT_MAX_CHARS", "20000"))
+SMART_EXTRACT_WINDOW = int(os.getenv("SMART_EXTRACT_WINDOW", "500"))
+
+# Model per tier: research and writing use the default tier; short
+# structured critiques (sub-agent reflection) use the small tier
+MODEL_TIERS = {
+    "default": "gpt-4.1",  # GPT-4.1 for detailed analysis and large contexts
+    "small": "gpt-4.1-mini",
+}
+
+# Wall-clock caps (seconds) on one async sub-agent LLM call; a call that
+# runs over is abandoned and retried, up to LLM_CALL_ATTEMPTS in total.
+# Streamed research is not capped in total (long extractions over large
+# contexts legitimately decode for minutes): RESEARCH_IDLE_TIMEOUT caps the
+# wait for the first chunk and between chunks instead.
+RESEARCH_IDLE_TIMEOUT = float(os.getenv("RESEARCH_IDLE_TIMEOUT", "90"))
+RESEARCH_TIMEOUT = float(os.getenv("RESEARCH_TIMEOUT", "180"))
+REFLECTION_TIMEOUT = float(os.getenv("REFLECTION_TIMEOUT", "60"))
+LLM_CALL_ATTEMPTS = max(1, int(os.getenv("LLM_CALL_ATTEMPTS", "2")))
+
+# Opt-in: reflect on up to REFLECTION_BATCH_SIZE sub-agents' findings in one
+# structured call instead of one call each (off by default: a single
+# reflection per call is the reviewed behaviour)
+BATCH_REFLECTIONS = os.getenv("BATCH_REFLECTIONS", "0") == "1"
+REFLECTION_BATCH_SIZE = max(1, int(os.getenv("REFLECTION_BATCH_SIZE", "8")))
+
+# Opt-in: skip the reflection call when the findings are heavily cited, span
+# several sources and flag no gaps (see sub_agent._heuristic_reflection). Off
+# by default like the other behaviour-changing switches: a skipped call means
+# a synthetic "high" reflection that never triggers refinement
+SKIP_CONFIDENT_REFLECTION = os.getenv("SKIP_CONFIDENT_REFLECTION", "0") == "1"
+
+# In-flight async LLM calls allowed per model tier (per graph run); the
+# tiers have separate provider rate limits
+LLM_MAX_CONCURRENCY = {
+    "default": max(1, int(os.getenv("LLM_MAX_CONCURRENCY", "8"))),
+    "small": max(1, int(os.getenv("SMALL_LLM_MAX_CONCURRENCY", "16"))),
+}
+
+# Keep-alive pool shared by all requests through one client, sized for many
+# concurrent sub-agents
+HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+
+
+def _cached(key: Hashable, factory: Callable[[], Any]) -> Any:
+    """Return the object cached under key for the current run.
+
+    Inside ``llm_run_scope`` the run's cache is used; synchronous callers
+    outside a run (no running loop) share one process-wide cache. Async
+    callers outside a run get a fresh, uncached object, so nothing
+    loop-bound outlives its loop.
+
+    Args:
+        key: Cache key
+        factory: Builds the object on a cache miss
+
+    Returns:
+        Cached object
+    """
+    cache = _run_cache.get()
+    if cache is None:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            cache = _sync_cache
+        else:
+            return factory()
+
+    obj = cache.get(key)
+    if obj is None:
+        obj = cache[key] = factory()
+    return obj
+
+
+@asynccontextmanager
+async def llm_run_scope() -> AsyncIterator[None]:
+    """Scope LLM clients and semaphores to one async run.
+
+    Clients, chains and per-tier semaphores requested inside the scope are
+    built once and shared by every node and sub-agent of the run (tasks
+    inherit the scope). On exit the cache is dropped and the run's async
+    HTTP pools are closed. Nested scopes reuse the outer one.
+    """
+    if _run_cache.get() is not None:
+        yield
+        return
+
+    cache: Dict[Hashable, Any] = {}
+    token = _run_cache.set(cache)
+    try:
+        yield
+    finally:
+        _run_cache.reset(token)
+        for obj in cache.values():
+            if isinstance(obj, httpx.AsyncClient):
+                await obj.aclose()
+
+
+def _sync_http_client() -> httpx.Client:
+    """Process-wide pooled HTTP client for synchronous LLM calls.
+
+    Sync clients are not bound to an event loop, so every run shares one.
+    """
+    client = _sync_cache.get("http_client")
+    if client is None:
+        client = _sync_cache["http_client"] = httpx.Client(limits=HTTP_LIMITS)
+    return client
+
+
+def get_llm_semaphore(tier: str = "default") -> asyncio.Semaphore:
+    """Get the semaphore capping in-flight calls to a model tier.
+
+    Semaphores belong to the running event loop, so one is created per run
+    (see ``llm_run_scope``).
+
+    Args:
+        tier: Model tier (see ``MODEL_TIERS``)
+
+    Returns:
+        Semaphore sized by ``LLM_MAX_CONCURRENCY``
+    """
+    return _cached(("semaphore", tier), lambda: asyncio.Semaphore(LLM_MAX_CONCURRENCY[tier]))
+
+
+def get_llm(tier: str = "default"):
     """Get configured LLM instance.
 
     Assumes OPENAI_API_KEY is set in environment.
-    Returns a ChatOpenAI instance configured for detailed research tasks.
+    Returns a ChatOpenAI instance configured for detailed research tasks
+    (or the smaller model for ``tier="small"``, see ``MODEL_TIERS``).
+    The client is constructed once per process for synchronous callers and
+    once per run for async callers (see ``llm_run_scope``), then shared.
+    """
+    return _cached(("llm", tier), lambda: ChatOpenAI(
+        model=MODEL_TIERS[tier],
+        temperature=LLM_TEMPERATURE,
+        http_client=_sync_http_client(),
+        http_async_client=_cached(("http_async_client", tier), lambda: httpx.AsyncClient(limits=HTTP_LIMITS)),
+    ))
+
+
+def get_structured_llm(schema: type, tier: str = "default", **kwargs):
+    """Get the shared LLM bound to a structured output schema.
+
+    The binding is built on first use and cached alongside the client.
+
+    Args:
+        schema: Pydantic model the response is parsed into
+        tier: Model tier (see ``MODEL_TIERS``)
+        **kwargs: Extra options for ``with_structured_output``
+
+    Returns:
+        Runnable producing ``schema`` instances
+    """
+    key = ("structured", schema, tier, tuple(sorted(kwargs.items())))
+    return _cached(key, lambda: get_llm(tier).with_structured_output(schema, **kwargs))
+
+
+def get_chain(prompt, schema: type = None, tier: str = "default", **kwargs):
+    """Get ``prompt | llm`` built once and cached alongside the client.
+
+    Args:
+        prompt: Module-level prompt template (cached by identity)
+        schema: Optional Pydantic model for structured output
+        tier: Model tier (see ``MODEL_TIERS``)
+        **kwargs: Extra options for ``with_structured_output`` (with schema)
+
+    Returns:
+        Runnable chain from prompt inputs to the model's response
     """
-    return ChatOpenAI(
-        model="gpt-4.1",  # GPT-4.1 for detailed analysis and large contexts
-        temperature=0,  # Zero temperature for maximum factual consistency
-    )
+    key = ("chain", id(prompt), schema, tier, tuple(sorted(kwargs.items())))
+    return _cached(key, lambda: prompt | (
+        get_structured_llm(schema, tier, **kwargs) if schema is not None else get_llm(tier)
+    ))
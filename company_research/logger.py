@@ -1,7 +1,8 @@
 """Verbose logging utilities for the research system."""
 
+import sys
 import time
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 
 
@@ -174,6 +175,18 @@ def log_verbose(message: str, indent: int = 0):
     print(f"{prefix}{Colors.DIM}{message}{Colors.RESET}")
 
 
+def log_lines(lines: List[str]):
+    """Write several pre-formatted lines with a single stdout write.
+
+    Use instead of ``print`` inside display loops.
+
+    Args:
+        lines: Lines to write (without trailing newlines)
+    """
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+
+
 def log_llm_call(
     purpose: str,
     prompt_preview: Optional[str] = None,
@@ -193,20 +206,26 @@ def log_llm_call(
     if not VERBOSE:
         return
 
-    print(f"   {Colors.ROBOT} {Colors.BOLD}AI Call:{Colors.RESET} {purpose}")
-    print(f"      {Colors.DIM}Model: {model}{Colors.RESET}")
+    # Lines are written in one go so concurrent sub-agents' calls don't
+    # interleave and each call costs a single stdout write
+    lines = [
+        f"   {Colors.ROBOT} {Colors.BOLD}AI Call:{Colors.RESET} {purpose}",
+        f"      {Colors.DIM}Model: {model}{Colors.RESET}",
+    ]
 
     if prompt_preview:
         truncated = prompt_preview[:truncate] + "..." if len(prompt_preview) > truncate else prompt_preview
-        print(f"      {Colors.SEND} {Colors.DIM}Prompt Preview ({len(prompt_preview)} chars):{Colors.RESET}")
-        for line in truncated.split('\n')[:5]:  # Max 5 lines
-            print(f"         {Colors.DIM}{line}{Colors.RESET}")
+        lines.append(f"      {Colors.SEND} {Colors.DIM}Prompt Preview ({len(prompt_preview)} chars):{Colors.RESET}")
+        for line in truncated.split('\n', 5)[:5]:  # Max 5 lines
+            lines.append(f"         {Colors.DIM}{line}{Colors.RESET}")
 
     if response_preview:
         truncated = response_preview[:truncate] + "..." if len(response_preview) > truncate else response_preview
-        print(f"      {Colors.RECEIVE} {Colors.DIM}Response Preview ({len(response_preview)} chars):{Colors.RESET}")
-        for line in truncated.split('\n')[:5]:  # Max 5 lines
-            print(f"         {Colors.DIM}{line}{Colors.RESET}")
+        lines.append(f"      {Colors.RECEIVE} {Colors.DIM}Response Preview ({len(response_preview)} chars):{Colors.RESET}")
+        for line in truncated.split('\n', 5)[:5]:  # Max 5 lines
+            lines.append(f"         {Colors.DIM}{line}{Colors.RESET}")
+
+    log_lines(lines)
 
 
 def log_state_transition(from_state: str, to_state: str, changes: Optional[Dict[str, Any]] = None):
@@ -332,17 +351,29 @@ def format_size(size_bytes: int) -> str:
         return f"{size_bytes / (1024 * 1024):.1f} MB"
 
 
-def truncate_text(text: str, max_length: int = 100, suffix: str = "...") -> str:
+def truncate_text(
+    text: str,
+    max_length: int = 100,
+    suffix: str = "...",
+    at_word: bool = False
+) -> str:
     """Truncate text to max length.
 
     Args:
         text: Text to truncate
         max_length: Maximum length
         suffix: Suffix to add if truncated
+        at_word: Cut at the last whitespace before the limit instead of
+            mid-word (falls back to a hard cut when there is none)
 
     Returns:
         Truncated text
     """
     if len(text) <= max_length:
         return text
-    return text[:max_length - len(suffix)] + suffix
+    cut = max_length - len(suffix)
+    if at_word:
+        boundary = max(text.rfind(" ", 0, cut + 1), text.rfind("\n", 0, cut + 1))
+        if boundary > 0:
+            return text[:boundary].rstrip() + suffix
+    return text[:cut] + suffix
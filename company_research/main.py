@@ -1,14 +1,15 @@
 """Main entry point for the company research system."""
 
 import json
+import asyncio
 import argparse
 from pathlib import Path
-from urllib.parse import urlparse
+from urllib.parse import urlsplit
 from typing import List
 from pydantic import HttpUrl
 
 from company_research.schema import ResearchBrief, ResearchState
-from company_research.agents.graph import build_graph
+from company_research.agents.graph import build_graph, run_graph
 from company_research.storage import save_state
 from company_research import logger
 from company_research.logger import Colors, log_header, log_step, log_metric, log_tree, Timer
@@ -51,9 +52,9 @@ def main(config_path: str = "config.json", verbose: bool = False):
 
     company_name: str = cfg["company_name"]
     request: str = cfg["request"]
-    seed_urls: List[HttpUrl] = cfg["seed_urls"]
+    seed_urls: List[HttpUrl] = list(dict.fromkeys(cfg["seed_urls"]))  # dedupe, keep order
 
-    allowed_domains = sorted({urlparse(u).netloc for u in seed_urls})
+    allowed_domains = sorted({urlsplit(u).netloc for u in seed_urls})
 
     log_tree([
         f"Company: {company_name}",
@@ -91,9 +92,7 @@ def main(config_path: str = "config.json", verbose: bool = False):
     # Execute workflow with timing
     print()  # spacing
     with Timer("Total Execution Time", verbose_only=False) as total_timer:
-        final_state = app.invoke({"state": state})
-
-    final_research_state: ResearchState = final_state["state"]
+        final_research_state: ResearchState = asyncio.run(run_graph(app, state))
 
     # Save state
     save_state(final_research_state)
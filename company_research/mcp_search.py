@@ -2,11 +2,38 @@
 
 import re
 import json
+from functools import cached_property
 from pathlib import Path
 from typing import List, Dict, Tuple, Optional
 from dataclasses import dataclass
 
 
+_MONTHS = r"(?:January|February|March|April|May|June|July|August|September|October|November|December)"
+
+# Every precise date format the research prompts ask for, compiled once:
+# ISO, "Month DD, YYYY", "DD Month YYYY", "Month YYYY" and "Q# YYYY".
+# Bare years are left out - they match far too much to signal a dated item.
+DATE_RE = re.compile(
+    r"\b\d{4}-\d{2}-\d{2}\b"
+    rf"|\b{_MONTHS}\s+\d{{1,2}},\s+\d{{4}}\b"
+    rf"|\b\d{{1,2}}\s+{_MONTHS}\s+\d{{4}}\b"
+    rf"|\b{_MONTHS}\s+\d{{4}}\b"
+    r"|\bQ[1-4]\s+\d{4}\b"
+)
+
+
+def extract_dates(text: str) -> List[str]:
+    """Find the dates in text, in any format matched by DATE_RE.
+
+    Args:
+        text: Text to scan
+
+    Returns:
+        Matched date strings, in order of appearance
+    """
+    return DATE_RE.findall(text)
+
+
 @dataclass
 class SearchPattern:
     """Pattern for searching scraped content."""
@@ -14,6 +41,11 @@ class SearchPattern:
     regex: str
     context_lines: int = 5  # Lines before/after match
 
+    @cached_property
+    def compiled(self) -> re.Pattern:
+        """Regex compiled once per pattern (reused across lines and files)."""
+        return re.compile(self.regex)
+
 
 @dataclass
 class SearchSnippet:
@@ -220,7 +252,7 @@ def search_file_with_pattern(
 
         # Search each line
         for line_idx, line in enumerate(lines):
-            matches = list(re.finditer(pattern.regex, line))
+            matches = list(pattern.compiled.finditer(line))
 
             for match in matches:
                 # Extract context lines
@@ -1,26 +1,12 @@
 """Pydantic models for the research system."""
 
+import hashlib
+from functools import cached_property
 from typing import List, Dict, Optional
 from pydantic import BaseModel, Field, HttpUrl
 
 
 # Scope-phase models (mirroring deep_research_from_scratch)
-class ClarifyWithUser(BaseModel):
-    """Decision + question for user clarification."""
-    need_clarification: bool = Field(
-        description="Whether the agent must ask the user a clarifying question "
-                    "before starting the research."
-    )
-    question: str = Field(
-        description="If clarification is needed, the question to ask the user "
-                    "to better scope the research."
-    )
-    verification: str = Field(
-        description="A confirmation message telling the user research will start "
-                    "after they answer the clarification question."
-    )
-
-
 class ResearchQuestion(BaseModel):
     """Research question and brief for guiding research."""
     research_brief: str = Field(
@@ -44,6 +30,7 @@ class ResearchBrief(BaseModel):
     seed_urls: List[HttpUrl]
     allowed_domains: List[str]
     constraints: List[str]
+    question_by_task_id: Dict[str, str] = Field(default_factory=dict)  # "q_0" -> sub-question, set by planning
 
 
 class PageContent(BaseModel):
@@ -53,12 +40,70 @@ class PageContent(BaseModel):
     text: str                          # cleaned text
     raw_html: Optional[str] = None     # may be omitted later
 
+    @cached_property
+    def source_block(self) -> str:
+        """Context block for this page, following its "=== SOURCE [i] ===" line.
+
+        Pages are not modified after fetch, so the block is built once and
+        reused by every context that includes the page.
+        """
+        return f"\nURL: {self.url}\nTitle: {self.title}\n\n{self.text}\n"
+
+    @cached_property
+    def source_digest(self) -> str:
+        """Hash of ``source_block``, identifying the page's rendered content
+        in context cache keys."""
+        return hashlib.blake2b(self.source_block.encode("utf-8"), digest_size=16).hexdigest()
+
+    @cached_property
+    def title_lower(self) -> str:
+        """Lowercased title, computed once for keyword matching."""
+        return self.title.lower()
+
+    @cached_property
+    def text_lower(self) -> str:
+        """Lowercased text, computed once and shared by every question's
+        keyword counting and by near-duplicate detection."""
+        return self.text.lower()
+
+    @cached_property
+    def keyword_counts(self) -> Dict[str, int]:
+        """Memo of keyword -> occurrence count in the title and text.
+
+        Filled by ``context.calculate_page_relevance`` so every sub-agent
+        question scoring the same page reuses the counts.
+        """
+        return {}
+
+
+REFINEMENT_ADDENDUM_HEADER = "\n\n---\n**REFINEMENT ADDENDUM:**\n\n"
+
+
+def findings_segments(findings: str, addenda: List[str]) -> List[str]:
+    """Lay out findings and their refinement addenda as text segments.
+
+    Notes keep refinement addenda instead of rebuilding their content;
+    joining the segments gives the merged text.
+
+    Args:
+        findings: Original findings
+        addenda: Refined findings, in merge order
+
+    Returns:
+        Segments to join (or write) in order
+    """
+    segments = [findings]
+    for addendum in addenda:
+        segments.extend((REFINEMENT_ADDENDUM_HEADER, addendum, "\n"))
+    return segments
+
 
 class Note(BaseModel):
     """Research note for a specific sub-question."""
     question_id: str                   # e.g. "decision_makers"
     content: str                       # LLM-written analysis with citations
     sources: List[HttpUrl]             # URLs used in that note
+    addenda: List[str] = Field(default_factory=list)  # V2.7: refinement findings, joined when rendered
 
 
 # V2.0: Supervisor + Sub-Agent models
@@ -80,6 +125,32 @@ class Reflection(BaseModel):
     )
 
 
+class ReflectionBatch(BaseModel):
+    """Reflections for several sub-agents' findings from one call."""
+    items: List[Reflection] = Field(
+        description="One reflection per item, in the same order as the items"
+    )
+
+
+class SubAgentAnswer(BaseModel):
+    """One sub-agent question's findings from a batched research call."""
+    task_id: str = Field(description="ID of the question being answered, exactly as given")
+    findings: str = Field(
+        description="Complete findings for this question, with inline citations [1], [2] and the cited URLs listed at the end"
+    )
+    missing: List[str] = Field(
+        default_factory=list,
+        description="Aspects of this question the sources do not answer"
+    )
+
+
+class BatchedFindings(BaseModel):
+    """Findings for several sub-agent questions over one shared context."""
+    answers: List[SubAgentAnswer] = Field(
+        description="One answer per question, in the same order as the questions"
+    )
+
+
 class SubAgentTask(BaseModel):
     """Task assignment for a sub-agent."""
     task_id: str                       # e.g. "decision_makers"
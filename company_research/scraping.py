@@ -1,11 +1,64 @@
 """Web scraping functionality for company research."""
 
+import re
+import time
+import random
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from typing import Dict, List, Optional, Union
 from urllib.parse import urlparse
 import requests
 from bs4 import BeautifulSoup
 import html2text
 from .schema import PageContent, ResearchBrief
+from .storage import cache_key, load_cached, save_cached
+
+
+# Fetched pages are reused from the on-disk cache for this long
+PAGE_CACHE_TTL = 24 * 3600  # 1 day
+
+# Transient fetch failures (connection errors, timeouts, these statuses) are
+# retried with exponential backoff plus jitter: ~1s, ~2s between attempts
+FETCH_ATTEMPTS = 3
+FETCH_BACKOFF_MAX = 8.0
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+def _is_transient(error: requests.RequestException) -> bool:
+    """Whether a failed request is worth retrying.
+
+    Args:
+        error: Exception raised by the request
+
+    Returns:
+        True for connection errors, timeouts and retryable HTTP statuses
+    """
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True
+    response = getattr(error, "response", None)
+    return response is not None and response.status_code in RETRY_STATUS_CODES
+
+
+# Three or more consecutive newlines (i.e. 2+ blank lines)
+_BLANK_LINE_RUNS = re.compile(r"\n{3,}")
+
+
+def compact_markdown(text: str) -> str:
+    """Drop whitespace that carries no content from converted markdown.
+
+    html2text leaves trailing spaces and long runs of blank lines behind
+    removed elements; every page is sent to the LLM many times, so these
+    are stripped once at ingest. Leading indentation (nested lists, code)
+    and single blank lines (paragraph breaks) are kept.
+
+    Args:
+        text: Markdown text
+
+    Returns:
+        Compacted markdown text
+    """
+    text = "\n".join(line.rstrip() for line in text.splitlines())
+    return _BLANK_LINE_RUNS.sub("\n\n", text).strip() + "\n"
 
 
 @dataclass
@@ -14,6 +67,7 @@ class CompanyScraper:
 
     brief: ResearchBrief
     timeout: int = 30
+    cache_ttl: Optional[float] = PAGE_CACHE_TTL  # None disables the page cache
 
     def _validate_url(self, url: str) -> None:
         """Validate that URL is in allowed domains.
@@ -31,6 +85,9 @@ class CompanyScraper:
     def fetch(self, url: str) -> PageContent:
         """Fetch and parse a web page, converting to markdown.
 
+        Pages fetched within ``cache_ttl`` are served from the on-disk cache,
+        skipping both the request and the HTML parse.
+
         Args:
             url: The URL to fetch
 
@@ -44,19 +101,44 @@ class CompanyScraper:
         """
         self._validate_url(url)
 
-        try:
-            # Use headers to mimic a real browser
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            resp = requests.get(url, timeout=self.timeout, headers=headers)
-            resp.raise_for_status()
-        except requests.RequestException as e:
-            raise Exception(f"Failed to fetch {url}: {str(e)}")
+        if self.cache_ttl is None:
+            return self._fetch_uncached(url)
+
+        key = cache_key(url)
+        cached = load_cached("pages", key, ttl=self.cache_ttl)
+        if cached is not None:
+            return PageContent.model_validate_json(cached)
+
+        page = self._fetch_uncached(url)
+        save_cached("pages", key, page.model_dump_json())
+        return page
+
+    def _fetch_uncached(self, url: str) -> PageContent:
+        """Fetch and parse a web page without consulting the page cache.
+
+        Args:
+            url: The URL to fetch (already validated)
+
+        Returns:
+            PageContent with markdown-formatted text
+        """
+        # Use headers to mimic a real browser
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+        }
+        for attempt in range(1, FETCH_ATTEMPTS + 1):
+            try:
+                resp = requests.get(url, timeout=self.timeout, headers=headers)
+                resp.raise_for_status()
+                break
+            except requests.RequestException as e:
+                if attempt == FETCH_ATTEMPTS or not _is_transient(e):
+                    raise Exception(f"Failed to fetch {url}: {str(e)}")
+                time.sleep(min(FETCH_BACKOFF_MAX, 2 ** (attempt - 1)) + random.uniform(0, 1))
 
         try:
             html = resp.text
-            soup = BeautifulSoup(html, "html.parser")
+            soup = BeautifulSoup(html, "lxml")
 
             # Extract title
             title = (soup.title.string or "").strip() if soup.title else ""
@@ -78,8 +160,34 @@ class CompanyScraper:
             h.skip_internal_links = False
 
             # Convert to markdown - get ALL content, no truncation
-            markdown_text = h.handle(str(main))
+            markdown_text = compact_markdown(h.handle(str(main)))
 
             return PageContent(url=url, title=title, text=markdown_text, raw_html=html)
         except Exception as e:
             raise Exception(f"Failed to parse {url}: {str(e)}")
+
+    def fetch_many(self, urls: List[str], max_workers: int = 16) -> Dict[str, Union[PageContent, Exception]]:
+        """Fetch several pages concurrently.
+
+        Fetching is network-bound, so the pages are requested from a thread
+        pool; a failure is returned in place of its page rather than raised.
+
+        Args:
+            urls: URLs to fetch
+            max_workers: Maximum concurrent requests
+
+        Returns:
+            Dictionary mapping each URL (in input order) to its PageContent,
+            or to the exception its fetch raised
+        """
+        if not urls:
+            return {}
+
+        def fetch_one(url: str) -> Union[PageContent, Exception]:
+            try:
+                return self.fetch(url)
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as executor:
+            return dict(zip(urls, executor.map(fetch_one, urls)))
@@ -1,11 +1,15 @@
 """Storage helpers for persisting research data."""
 
 import json
+import time
+import hashlib
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Optional
 from .schema import PageContent, Note, ResearchState
 
 BASE_DIR = Path("artifacts")
+CACHE_DIR = BASE_DIR / "cache"
+DEFAULT_CACHE_TTL = 7 * 24 * 3600  # 7 days
 
 
 def save_page(page: PageContent) -> None:
@@ -75,3 +79,48 @@ def save_state(state: ResearchState) -> None:
     out = BASE_DIR / "state.json"
     out.parent.mkdir(parents=True, exist_ok=True)
     out.write_text(state.model_dump_json(indent=2), encoding="utf-8")
+
+
+def cache_key(*parts: str) -> str:
+    """Build a stable cache key from text parts.
+
+    Args:
+        *parts: Values identifying the cached result
+
+    Returns:
+        SHA-256 hex digest of the parts
+    """
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def load_cached(namespace: str, key: str, ttl: float = DEFAULT_CACHE_TTL) -> Optional[str]:
+    """Load a cached payload if present and not older than ttl.
+
+    Args:
+        namespace: Cache namespace (subdirectory of the cache dir)
+        key: Key from ``cache_key``
+        ttl: Maximum age in seconds
+
+    Returns:
+        Cached payload, or None on a miss or expired entry
+    """
+    path = CACHE_DIR / namespace / f"{key}.json"
+    try:
+        if time.time() - path.stat().st_mtime > ttl:
+            return None
+        return path.read_text(encoding="utf-8")
+    except OSError:
+        return None
+
+
+def save_cached(namespace: str, key: str, payload: str) -> None:
+    """Store a payload in the on-disk cache.
+
+    Args:
+        namespace: Cache namespace (subdirectory of the cache dir)
+        key: Key from ``cache_key``
+        payload: Serialized result (e.g. ``model_dump_json()``)
+    """
+    out = CACHE_DIR / namespace / f"{key}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(payload, encoding="utf-8")
@@ -0,0 +1,16 @@
+"""Shared pytest configuration for the test modules."""
+
+import pytest
+from company_research import storage
+
+
+# test_mcp_search.py is a standalone script over artifacts/pages (run it
+# with python after a research run), not a pytest module
+collect_ignore = ["test_mcp_search.py"]
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    """Point the on-disk response cache at a per-test directory."""
+    monkeypatch.setattr(storage, "CACHE_DIR", tmp_path / "cache")
+    return tmp_path / "cache"
@@ -0,0 +1,57 @@
+"""Test the cached LLM factories and the per-run client scope."""
+
+import asyncio
+import httpx
+from langchain_core.prompts import ChatPromptTemplate
+from company_research import config
+
+
+def test_sync_callers_share_cached_objects(monkeypatch):
+    monkeypatch.setattr(config, "_sync_cache", {})
+    first = config._cached(("key",), object)
+    assert config._cached(("key",), object) is first
+    assert config._cached(("other",), object) is not first
+
+
+def test_get_chain_is_built_once_per_prompt(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setattr(config, "_sync_cache", {})
+    prompt = ChatPromptTemplate.from_messages([("user", "{question}")])
+    other = ChatPromptTemplate.from_messages([("user", "{question}")])
+
+    chain = config.get_chain(prompt)
+    assert config.get_chain(prompt) is chain
+    # Prompts are cached by identity, and share the one client
+    assert config.get_chain(other) is not chain
+    assert config.get_llm() is config.get_llm()
+
+
+def test_run_scope_caches_per_run_and_closes_async_clients():
+    async def run():
+        async with config.llm_run_scope():
+            client = config._cached(("client",), httpx.AsyncClient)
+            semaphore = config.get_llm_semaphore("small")
+            assert config._cached(("client",), httpx.AsyncClient) is client
+            assert config.get_llm_semaphore("small") is semaphore
+            # Nested scopes (and tasks) share the outer run's cache
+            async with config.llm_run_scope():
+                assert await asyncio.create_task(_get_client()) is client
+            assert not client.is_closed
+        return client, semaphore
+
+    async def _get_client():
+        return config._cached(("client",), httpx.AsyncClient)
+
+    first_client, first_semaphore = asyncio.run(run())
+    assert first_client.is_closed
+    second_client, second_semaphore = asyncio.run(run())
+    assert second_client is not first_client
+    assert second_semaphore is not first_semaphore
+
+
+def test_async_callers_outside_a_run_are_not_cached():
+    async def run():
+        return config._cached(("key",), object), config._cached(("key",), object)
+
+    first, second = asyncio.run(run())
+    assert first is not second
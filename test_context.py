@@ -0,0 +1,92 @@
+"""Test context deduplication (duplicate pages and repeated paragraphs)."""
+
+from company_research.schema import PageContent
+from company_research.agents.context import (
+    build_context, dedupe_pages, dedupe_paragraphs, select_relevant_pages,
+    MIN_DEDUPE_PARAGRAPH_CHARS,
+)
+
+
+def _page(url, text, title="Page"):
+    return PageContent(url=url, title=title, text=text)
+
+
+BOILERPLATE = "Subscribe to our newsletter for the latest updates on our portfolio, team and insights."
+assert len(BOILERPLATE) >= MIN_DEDUPE_PARAGRAPH_CHARS
+
+
+def test_dedupe_pages_drops_same_canonical_url():
+    first = _page("https://www.example.com/team/", "Alice leads the investment team.")
+    pages = [
+        first,
+        _page("https://example.com/team?utm_source=x", "Different text entirely here."),
+        _page("http://EXAMPLE.com/team#bio", "Yet another body of text."),
+    ]
+    assert dedupe_pages(pages) == [first]
+
+
+def test_dedupe_pages_drops_near_duplicate_text():
+    text = " ".join(f"word{i}" for i in range(200))
+    first = _page("https://example.com/about", text)
+    mirror = _page("https://example.com/about-us", text + " extra")
+    other = _page("https://example.com/news", " ".join(f"item{i}" for i in range(200)))
+    assert dedupe_pages([first, mirror, other]) == [first, other]
+
+
+def test_dedupe_pages_keeps_order_of_distinct_pages():
+    pages = [_page(f"https://example.com/p{i}", f"Unique body number {i} of the site.") for i in range(3)]
+    assert dedupe_pages(pages) == pages
+
+
+def test_dedupe_paragraphs_drops_repeated_boilerplate():
+    first = _page("https://example.com/a", f"About us.\n\n{BOILERPLATE}")
+    second = _page("https://example.com/b", f"About us.\n\n  {BOILERPLATE.upper()}\n\nOur team.")
+    deduped = dedupe_paragraphs([first, second])
+
+    # The first occurrence is kept, unchanged pages are the same objects
+    assert deduped[0] is first
+    # Repeats are matched case- and whitespace-insensitively; short
+    # paragraphs (headings) may repeat
+    assert deduped[1].text == "About us.\n\nOur team."
+    assert deduped[1].url == second.url and deduped[1].title == second.title
+
+
+def test_dedupe_paragraphs_without_repeats_returns_same_pages():
+    pages = [_page("https://example.com/a", BOILERPLATE), _page("https://example.com/b", "Short.")]
+    deduped = dedupe_paragraphs(pages)
+    assert all(d is p for d, p in zip(deduped, pages))
+
+
+TEAM = _page("https://example.com/team", "Our leadership team: each partner and director. " * 5)
+NEWS = _page("https://example.com/news", "Press release: announcement of a new fund. " * 5)
+LEGAL = _page("https://example.com/legal", "Terms of use and privacy policy. " * 5)
+LEADERSHIP_QUESTION = "Who is on the leadership team?"
+
+
+def test_select_relevant_pages_keeps_top_scoring():
+    pages = [LEGAL, NEWS, TEAM]
+    assert select_relevant_pages(pages, LEADERSHIP_QUESTION, top_k=1, min_chars=0) == [TEAM]
+    # Pages scoring zero are never selected
+    assert select_relevant_pages(pages, LEADERSHIP_QUESTION, top_k=2, min_chars=0) == [TEAM]
+
+
+def test_select_relevant_pages_falls_back_to_all_pages():
+    pages = [LEGAL, NEWS, TEAM]
+    # No ranking keywords in the question
+    assert select_relevant_pages(pages, "Describe the weather", top_k=1, min_chars=0) == pages
+    # No more pages than top_k
+    assert select_relevant_pages(pages, LEADERSHIP_QUESTION, top_k=3, min_chars=0) == pages
+    # Selection holds too little text
+    assert select_relevant_pages(pages, LEADERSHIP_QUESTION, top_k=1, min_chars=10 ** 6) == pages
+
+
+def test_build_context_tracks_page_content():
+    # Same URL and text length, different title or text: never a stale context
+    first = _page("https://example.com/a", "Alpha text body.", title="One")
+    retitled = _page("https://example.com/a", "Alpha text body.", title="Two")
+    edited = _page("https://example.com/a", "Bravo text body.", title="One")
+
+    assert "Title: One" in build_context([first])
+    assert "Title: Two" in build_context([retitled])
+    assert "Bravo text body." in build_context([edited])
+    assert build_context([first]) == build_context([_page("https://example.com/a", "Alpha text body.", title="One")])
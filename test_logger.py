@@ -0,0 +1,19 @@
+"""Test logging helpers."""
+
+from company_research.logger import truncate_text
+
+
+def test_truncate_text_short_text_is_unchanged():
+    assert truncate_text("short", 10) == "short"
+
+
+def test_truncate_text_hard_cut():
+    assert truncate_text("abcdefghijkl", 10) == "abcdefg..."
+
+
+def test_truncate_text_at_word():
+    text = "alpha beta gamma delta"
+    assert truncate_text(text, 15, at_word=True) == "alpha beta..."
+    assert len(truncate_text(text, 15, at_word=True)) <= 15
+    # No whitespace before the limit: falls back to a hard cut
+    assert truncate_text("abcdefghijkl mn", 10, at_word=True) == "abcdefg..."
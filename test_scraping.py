@@ -0,0 +1,81 @@
+"""Test markdown compaction and fetch retries."""
+
+import pytest
+import requests
+from company_research import scraping
+from company_research.schema import ResearchBrief
+from company_research.scraping import CompanyScraper, compact_markdown, FETCH_ATTEMPTS
+
+
+URL = "https://example.com/team"
+HTML = "<html><head><title>Team</title></head><body><main><p>Alice leads the team.</p></main></body></html>"
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, text=HTML):
+        self.status_code = status_code
+        self.text = text
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} error", response=self)
+
+
+@pytest.fixture
+def scraper(monkeypatch):
+    monkeypatch.setattr(scraping.time, "sleep", lambda seconds: None)
+    brief = ResearchBrief(
+        company_name="Example", main_question="Research Example", sub_questions=[],
+        seed_urls=[URL], allowed_domains=["example.com"], constraints=[]
+    )
+    return CompanyScraper(brief=brief, cache_ttl=None)
+
+
+def _fake_get(monkeypatch, outcomes):
+    """Make requests.get return (or raise) each outcome in turn."""
+    calls = []
+
+    def get(url, timeout, headers):
+        outcome = outcomes[len(calls)]
+        calls.append(url)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    monkeypatch.setattr(scraping.requests, "get", get)
+    return calls
+
+
+def test_compact_markdown():
+    text = "# Title   \n\n\n\n  - nested item  \n\nParagraph\t\n\n\n"
+    assert compact_markdown(text) == "# Title\n\n  - nested item\n\nParagraph\n"
+
+
+def test_transient_failures_are_retried(scraper, monkeypatch):
+    calls = _fake_get(monkeypatch, [requests.ConnectionError("reset"), FakeResponse(503), FakeResponse()])
+    page = scraper.fetch(URL)
+    assert len(calls) == 3
+    assert page.title == "Team"
+    assert "Alice leads the team." in page.text
+
+
+def test_client_errors_are_not_retried(scraper, monkeypatch):
+    calls = _fake_get(monkeypatch, [FakeResponse(404), FakeResponse()])
+    with pytest.raises(Exception, match="Failed to fetch"):
+        scraper.fetch(URL)
+    assert len(calls) == 1
+
+
+def test_retries_give_up_after_fetch_attempts(scraper, monkeypatch):
+    calls = _fake_get(monkeypatch, [requests.Timeout("slow")] * FETCH_ATTEMPTS)
+    with pytest.raises(Exception, match="Failed to fetch"):
+        scraper.fetch(URL)
+    assert len(calls) == FETCH_ATTEMPTS
+
+
+def test_fetch_many_reports_failures_in_place(scraper, monkeypatch):
+    monkeypatch.setattr(scraping.requests, "get", lambda url, timeout, headers: FakeResponse())
+    fetched = scraper.fetch_many([URL, "https://other.org/"])
+    assert list(fetched) == [URL, "https://other.org/"]
+    assert fetched[URL].title == "Team"
+    assert isinstance(fetched["https://other.org/"], ValueError)
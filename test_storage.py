@@ -0,0 +1,29 @@
+"""Test the on-disk response cache (keys, round trip, expiry)."""
+
+import hashlib
+from company_research.storage import cache_key, load_cached, save_cached
+
+
+def test_cache_key_is_stable_and_order_sensitive():
+    # Keys are plain SHA-256 digests, so they match across runs and processes
+    assert cache_key("a", "b") == hashlib.sha256(b"a\x1fb").hexdigest()
+    assert cache_key("a", "b") == cache_key("a", "b")
+    assert cache_key("a", "b") != cache_key("b", "a")
+    assert cache_key("a", "b") != cache_key("ab")
+
+
+def test_save_and_load_cached_roundtrip():
+    key = cache_key("question", "context")
+    assert load_cached("findings", key) is None
+
+    save_cached("findings", key, '"payload"')
+    assert load_cached("findings", key) == '"payload"'
+    # Namespaces are separate
+    assert load_cached("reflections", key) is None
+
+
+def test_expired_entries_miss():
+    key = cache_key("page")
+    save_cached("pages", key, "{}")
+    assert load_cached("pages", key, ttl=3600) == "{}"
+    assert load_cached("pages", key, ttl=-1) is None
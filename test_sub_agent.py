@@ -0,0 +1,302 @@
+"""Test sub-agent helpers: reflection checklists, the local confidence
+heuristic, timeouts, batched reflection and the concurrent pipeline."""
+
+import asyncio
+import re
+from types import SimpleNamespace
+import pytest
+from company_research.schema import SubAgentTask, SubAgentResult, Reflection, ReflectionBatch, PageContent
+from company_research.storage import load_cached
+from company_research.agents import sub_agent
+from company_research.agents.planner import SUB_QUESTION_TEMPLATES
+from company_research.agents.sub_agent import (
+    get_reflection_checklist, _heuristic_reflection, _reflection_inputs,
+    _call_with_timeout, _acollect_stream, _reflect_batch_async, _response_cache_key,
+    execute_sub_agents, REFLECTION_PROMPT, REFLECTION_TIER,
+    CONFIDENT_MIN_CHARS, CONFIDENT_MIN_NEWS_ITEMS,
+    NEWS_CHECKLIST, PEOPLE_CHECKLIST, PORTFOLIO_CHECKLIST,
+    FINANCIAL_CHECKLIST, STRATEGY_CHECKLIST, GENERIC_CHECKLIST,
+)
+
+
+# Checklist each core sub-question is reflected against (template order)
+CORE_CHECKLISTS = [
+    PEOPLE_CHECKLIST,     # decision makers / leadership
+    GENERIC_CHECKLIST,    # regions and sectors
+    FINANCIAL_CHECKLIST,  # AUM / platform metrics
+    PORTFOLIO_CHECKLIST,  # strategies, funds and programs ("private investing")
+    PORTFOLIO_CHECKLIST,  # portfolio companies
+    NEWS_CHECKLIST,       # news and announcements
+]
+
+
+@pytest.mark.parametrize("company", ["Acme", "Northwind Capital Investments"])
+def test_core_questions_get_expected_checklist(company):
+    # The company name (last clause) must not change the checklist
+    questions = [t.format(company=company) for t in SUB_QUESTION_TEMPLATES]
+    assert [get_reflection_checklist(q) for q in questions] == CORE_CHECKLISTS
+
+
+def test_checklist_priority():
+    assert get_reflection_checklist("Latest news on the portfolio") is NEWS_CHECKLIST
+    assert get_reflection_checklist("Who is on the leadership team?") is PEOPLE_CHECKLIST
+    assert get_reflection_checklist("Which portfolio companies raised capital?") is PORTFOLIO_CHECKLIST
+    assert get_reflection_checklist("What is the total AUM?") is FINANCIAL_CHECKLIST
+    assert get_reflection_checklist("Which companies are held?") is PORTFOLIO_CHECKLIST
+    assert get_reflection_checklist("Describe each fund strategy") is STRATEGY_CHECKLIST
+    assert get_reflection_checklist("Describe the regions covered") is GENERIC_CHECKLIST
+
+
+NEWS_QUESTION = "What are the recent news items and announcements?"
+PEOPLE_QUESTION = "Who are the key decision makers?"
+
+
+def _findings(items=10, dated=10, sources=4, extra=""):
+    """Well-structured findings: one cited list item per entry, the first
+    ``dated`` of them dated, padded past CONFIDENT_MIN_CHARS."""
+    lines = ["## Recent announcements"]
+    for i in range(items):
+        date = "March 12, 2024: " if i < dated else ""
+        lines.append(f"- {date}The firm announced partnership {i} with a regional operator [{i % sources + 1}]")
+    lines.append("## Summary")
+    lines.append(extra + "The firm expanded its platform across several markets. " * 40)
+    findings = "\n".join(lines)
+    assert len(findings) >= CONFIDENT_MIN_CHARS
+    return findings
+
+
+def _reflect(question, findings):
+    task = SubAgentTask(task_id="q_0", question=question, context_urls=[])
+    return _heuristic_reflection(task, {"question": question, "findings": findings})
+
+
+@pytest.fixture(autouse=True)
+def skip_confident_reflection(monkeypatch):
+    monkeypatch.setattr(sub_agent, "SKIP_CONFIDENT_REFLECTION", True)
+
+
+def test_confident_findings_skip_reflection():
+    reflection = _reflect(PEOPLE_QUESTION, _findings())
+    assert reflection is not None
+    assert reflection.is_complete and reflection.confidence == "high"
+    assert reflection.missing_aspects == []
+
+
+def test_heuristic_disabled(monkeypatch):
+    monkeypatch.setattr(sub_agent, "SKIP_CONFIDENT_REFLECTION", False)
+    assert _reflect(PEOPLE_QUESTION, _findings()) is None
+
+
+@pytest.mark.parametrize("gap", ["The AUM is not disclosed. ", "Headcount is unknown. ", "No information on fees. "])
+def test_gap_phrase_forces_reflection(gap):
+    assert _reflect(PEOPLE_QUESTION, _findings(extra=gap)) is None
+
+
+def test_short_findings_force_reflection():
+    assert _reflect(PEOPLE_QUESTION, _findings()[:CONFIDENT_MIN_CHARS - 1]) is None
+
+
+def test_citation_minimums():
+    # Too few distinct sources, then too few citations in total
+    assert _reflect(PEOPLE_QUESTION, _findings(sources=2)) is None
+    assert _reflect(PEOPLE_QUESTION, _findings(items=5, dated=5)) is None
+
+
+def test_news_item_count_and_dated_share():
+    items = CONFIDENT_MIN_NEWS_ITEMS + 2
+    assert _reflect(NEWS_QUESTION, _findings(items=items, dated=items)) is not None
+    assert _reflect(NEWS_QUESTION, _findings(items=items, dated=8)) is not None   # 80% dated
+    assert _reflect(NEWS_QUESTION, _findings(items=items, dated=7)) is None       # 70% dated
+    # Fewer than CONFIDENT_MIN_NEWS_ITEMS items (but enough citations elsewhere)
+    few = _findings(items=CONFIDENT_MIN_NEWS_ITEMS - 1, dated=CONFIDENT_MIN_NEWS_ITEMS - 1)
+    few += " [1] [2] [3]"
+    assert _reflect(NEWS_QUESTION, few) is None
+    # The same undated findings pass for a non-news question
+    assert _reflect(PEOPLE_QUESTION, _findings(items=items, dated=0)) is not None
+
+
+def test_refinement_reflects_on_original_question():
+    # Refinement tasks carry their parent's task_id as question
+    task = SubAgentTask(task_id="q_5_refinement", question="q_5", context_urls=[], is_refinement=True)
+    items = CONFIDENT_MIN_NEWS_ITEMS + 2
+    inputs, _ = _reflection_inputs(task, _findings(items=items, dated=0), "sample", NEWS_QUESTION)
+
+    assert inputs["question"] == NEWS_QUESTION
+    assert inputs["question_specific_checklist"] is NEWS_CHECKLIST
+    # Undated news findings still need the reflection call
+    assert _heuristic_reflection(task, inputs) is None
+
+
+# Timeouts and streaming
+
+def _stream(*delays):
+    """Async stream yielding one chunk after each delay (seconds)."""
+    async def chunks():
+        for index, delay in enumerate(delays):
+            await asyncio.sleep(delay)
+            yield SimpleNamespace(content=str(index))
+    return chunks()
+
+
+def test_timeout_error_names_call_tier_and_limit(monkeypatch):
+    monkeypatch.setattr(sub_agent, "LLM_CALL_ATTEMPTS", 1)
+    with pytest.raises(TimeoutError, match=re.escape("Research for q_0 (small tier) timed out after 0s in total")):
+        asyncio.run(_call_with_timeout(lambda: asyncio.sleep(1), 0.01, "Research for q_0", tier="small"))
+
+
+def test_timed_out_call_is_retried(monkeypatch):
+    monkeypatch.setattr(sub_agent, "LLM_CALL_ATTEMPTS", 2)
+    attempts = []
+
+    async def call():
+        attempts.append(1)
+        await asyncio.sleep(1 if len(attempts) == 1 else 0)
+        return "done"
+
+    assert asyncio.run(_call_with_timeout(call, 0.05, "Research for q_0")) == "done"
+    assert len(attempts) == 2
+
+
+def test_stream_timeout_is_per_chunk_not_total(monkeypatch):
+    monkeypatch.setattr(sub_agent, "LLM_CALL_ATTEMPTS", 1)
+    task = SubAgentTask(task_id="q_0", question=NEWS_QUESTION, context_urls=[])
+
+    # Five chunks, 0.3s in total, but never 0.1s without output
+    findings = asyncio.run(_call_with_timeout(
+        lambda: _acollect_stream(_stream(0.06, 0.06, 0.06, 0.06, 0.06), task, 0.1),
+        0.1, "Research for q_0", idle=True
+    ))
+    assert findings == "01234"
+
+    # A stream that stalls fails with the idle limit in the message
+    with pytest.raises(TimeoutError, match="without output"):
+        asyncio.run(_call_with_timeout(
+            lambda: _acollect_stream(_stream(0.01, 0.5), task, 0.1),
+            0.1, "Research for q_0", idle=True
+        ))
+
+
+# Batched reflection
+
+HIGH = Reflection(is_complete=True, missing_aspects=[], confidence="high", next_steps=None)
+LOW = Reflection(is_complete=False, missing_aspects=["dates"], confidence="low", next_steps=None)
+
+
+def _researched(*task_ids):
+    """(task, findings, reflection inputs, preview, source pages) per task."""
+    items = []
+    for task_id in task_ids:
+        task = SubAgentTask(task_id=task_id, question=PEOPLE_QUESTION, context_urls=[])
+        findings = f"Findings for {task_id} [1]"
+        inputs, preview = _reflection_inputs(task, findings, "sample")
+        items.append((task, findings, inputs, preview, []))
+    return items
+
+
+def _batch_chain(monkeypatch, outcome):
+    """Make get_chain return a chain whose ainvoke returns (or raises) outcome."""
+    calls = []
+
+    async def ainvoke(inputs):
+        calls.append(inputs)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    monkeypatch.setattr(sub_agent, "get_chain", lambda *args, **kwargs: SimpleNamespace(ainvoke=ainvoke))
+    return calls
+
+
+def _individual_reflections(monkeypatch, failing=()):
+    """Replace the single reflection call; tasks in ``failing`` raise."""
+    reflected = []
+
+    async def reflect(task, reflection_inputs):
+        reflected.append(task.task_id)
+        if task.task_id in failing:
+            raise ValueError(f"reflection failed for {task.task_id}")
+        return HIGH
+
+    monkeypatch.setattr(sub_agent, "_reflect_async", reflect)
+    return reflected
+
+
+def test_failed_batch_falls_back_per_task(monkeypatch):
+    _batch_chain(monkeypatch, RuntimeError("batch down"))
+    reflected = _individual_reflections(monkeypatch, failing={"q_1"})
+
+    reflections = asyncio.run(_reflect_batch_async(_researched("q_0", "q_1")))
+
+    assert reflected == ["q_0", "q_1"]
+    assert reflections[0] == HIGH
+    assert isinstance(reflections[1], ValueError)
+
+
+def test_short_batch_falls_back_per_task(monkeypatch):
+    _batch_chain(monkeypatch, ReflectionBatch(items=[LOW]))
+    reflected = _individual_reflections(monkeypatch)
+
+    assert asyncio.run(_reflect_batch_async(_researched("q_0", "q_1"))) == [HIGH, HIGH]
+    assert reflected == ["q_0", "q_1"]
+
+
+def test_batch_reflections_are_cached_apart_from_single_reflections(monkeypatch):
+    researched = _researched("q_0", "q_1")
+    calls = _batch_chain(monkeypatch, ReflectionBatch(items=[LOW, HIGH]))
+    assert asyncio.run(_reflect_batch_async(researched)) == [LOW, HIGH]
+    assert len(calls) == 1
+
+    # A rerun is served from the cache, without a call
+    calls = _batch_chain(monkeypatch, RuntimeError("should not be called"))
+    assert asyncio.run(_reflect_batch_async(researched)) == [LOW, HIGH]
+    assert calls == []
+
+    # ... but never as the single reflection prompt's response
+    for _, _, inputs, _, _ in researched:
+        key = _response_cache_key(REFLECTION_PROMPT, inputs, REFLECTION_TIER)
+        assert load_cached("reflections", key) is None
+
+
+# Concurrent pipeline
+
+PAGES = [
+    PageContent(url=f"https://example.com/p{i}", title=f"Page {i}", text=f"Body {i}")
+    for i in range(3)
+]
+
+
+def test_execute_sub_agents_bounds_concurrency_and_isolates_failures(monkeypatch):
+    in_flight = []
+    peak = []
+
+    async def research(task, pages, company_name, original_question=None, shared_context=None):
+        in_flight.append(task.task_id)
+        peak.append(len(in_flight))
+        try:
+            await asyncio.sleep(0.02)
+            if task.task_id == "q_bad":
+                raise RuntimeError("research failed")
+        finally:
+            in_flight.remove(task.task_id)
+        inputs = {"question": task.question, "findings": f"Findings for {task.task_id}"}
+        return inputs["findings"], inputs, "", list(pages)
+
+    monkeypatch.setattr(sub_agent, "research_sub_agent_async", research)
+    _individual_reflections(monkeypatch)
+
+    task_ids = ["q_0", "q_1", "q_bad", "q_3", "q_4", "q_5"]
+    tasks = [SubAgentTask(task_id=t, question=PEOPLE_QUESTION, context_urls=[]) for t in task_ids]
+    outcomes = asyncio.run(execute_sub_agents(
+        tasks, PAGES, "Acme",
+        contexts={"q_0": "prebuilt"}, context_pages={"q_0": PAGES[:1]},
+        max_concurrency=2, batch_reflections=False, batch_questions=False
+    ))
+
+    assert max(peak) == 2
+    assert list(outcomes) == task_ids
+    assert isinstance(outcomes["q_bad"], RuntimeError)
+    results = [outcomes[t] for t in task_ids if t != "q_bad"]
+    assert all(isinstance(result, SubAgentResult) for result in results)
+    # Sources are the pages behind each task's context
+    assert outcomes["q_0"].sources == [PAGES[0].url]
+    assert outcomes["q_1"].sources == [p.url for p in PAGES]